@@ -1,32 +1,33 @@
 # -*- coding: utf-8 -*-
-import base64
+import functools
 import json
 import os
+import sys
+from dataclasses import dataclass
 
 import pulumi
 import pulumi_aws as aws
 import pulumi_eks as eks
 import pulumi_kubernetes as k8s
-from pulumi_docker import BuilderVersion, DockerBuildArgs, Image
+from pulumi_docker import BuilderVersion, CacheFromArgs, DockerBuildArgs, Image
 from pulumi_kubernetes.helm.v3 import Release, ReleaseArgs, RepositoryOptsArgs
 
 from infra.app import declare_app_zone
+from infra.aws import acm
 from infra.aws.cognito import delete_users_in_pool
-from infra.aws.ecr import declare_image_in_ecr
+from infra.aws.ecr import (
+    declare_image_in_ecr,
+    declare_image_in_repo,
+    registry_credentials,
+)
 from infra.aws.loadbalancer import declare_alb_controller
 from infra.aws.s3 import (
     delete_objects_in_bucket,
-    get_objects_in_bucket,
     list_objects_in_bucket,
     put_objects_in_bucket,
 )
-from infra.aws.sqs import consume_from_queues, declare_queue_with_dlq, publish_to_queues
-from infra.common import base64_str, image_sha, to_k8s_secret
-from infra.datadog.agent import (
-    datadog_annotations,
-    datadog_labels,
-    declare_datadog_cluster_agent,
-)
+from infra.aws.sqs import consume_from_queues, declare_queue_with_dlq
+from infra.common import base64_str, to_k8s_secret
 from infra.dbproxy import declare_dbproxy
 from infra.http_servers.http_server import PublicHttpServer, declare_http_server
 from infra.workers.worker import declare_worker
@@ -37,6 +38,13 @@ cluster_tag = f"kubernetes.io/cluster/{cluster_name}"
 
 stack = pulumi.get_stack()
 aws_config = pulumi.Config("aws")
+# Explicitly declared AWS providers don't pick up the aws:* stack config, so
+# forward the retry settings to them. Adaptive retries absorb API throttling
+# when many resources are created concurrently.
+aws_retry_args = {
+    "max_retries": aws_config.get_int("maxRetries"),
+    "retry_mode": aws_config.get("retryMode"),
+}
 # Get some values from the Pulumi configuration (or use defaults)
 config = pulumi.Config()
 
@@ -52,25 +60,30 @@ gpu_node_instance_type = config.get("gpu-node-instance-type") or "g4dn.xlarge"
 llm_node_instance_type = config.get("llm-gpu-node-instance-type") or "g4dn.xlarge"
 ray_head_node_instance_type = config.get("ray-head-instance-type") or "m5.xlarge"
 vpc_cidr = config.require("vpc-network-cidr")
-
-
-def run_checks():
-    is_ci = os.getenv("GITHUB_ACTION") or False
-    # Only run checks for production
-    if stack == "prod" and not is_ci:
-        print(
-            """
+domain = config.require("domain")  # e.g. "staging.re-collect.cloud"
+llm_provider = config.require("llm-provider")
+
+# Aurora (managed PostgreSQL) lives in its own VPC, possibly in a different
+# region, and is peered with the cluster VPC.
+aurora_vpc_cidr = config.require("aurora-vpc-network-cidr")
+aurora_vpc_id = config.require("aurora-rds-vpc-id")
+aurora_owner_id = config.require("aurora-rds-owner-id")
+aurora_region = config.require("aurora-rds-region")
+aurora_route_table_id = config.require("aurora-routetable-id")
+aurora_security_group_id = config.require("aurora-securitygroup-id")
+
+# Only production deployments are restricted (to CI)
+if stack == "prod" and not os.environ.get("GITHUB_ACTION"):
+    sys.exit(
+        """
 ⛔️ Production deployments only from CI ⛔️
    -----------------------------------
 If this is a justifiable exception:
 - Notify the team (#engineering on Slack)
 - Set GITHUB_ACTION=true and re-run your command
 """
-        )
-        exit(1)
-
+    )
 
-run_checks()
 
 # Create a VPC for the EKS cluster
 #
@@ -88,17 +101,15 @@ run_checks()
 #
 # https://www.learnaws.org/2021/06/22/aws-eks-alb-controller-pulumi/
 
-availability_zones = config.get_object("availability-zones")
-public_subnet_cidrs = config.get_object("public-subnet-cidrs")
+availability_zones = tuple(config.require_object("availability-zones"))
+public_subnet_cidrs = tuple(config.require_object("public-subnet-cidrs"))
 # private subnet can access the internet by using a network address translation
 # (NAT) gateway that resides in the public subnet, those need Elastic IP configured
-private_subnet_cidrs = config.get_object("private-subnet-cidrs")
+private_subnet_cidrs = tuple(config.require_object("private-subnet-cidrs"))
 
-# sanity check
-if env == "prod":
-    assert "us-east-1a" in availability_zones
-else:
-    assert "us-west-2a" in availability_zones
+# sanity check; runs on preview too, so a stack config pointing at the wrong
+# region is caught before anything is planned against it
+assert ("us-east-1a" if env == "prod" else "us-west-2a") in availability_zones
 
 # ??? awsx.ec2.Vpc does not have vpc.default_security_group_id available?
 vpc = aws.ec2.Vpc(
@@ -133,23 +144,23 @@ igw = aws.ec2.InternetGateway(
 
 # attach VPC peering ingress/egress rules to VPC default security group
 aws.ec2.SecurityGroupRule(
-    f"peer-src-sec-grp-rule-ingress",
+    "peer-src-sec-grp-rule-ingress",
     type="ingress",
     from_port=5432,
     to_port=5432,
     protocol="tcp",
-    cidr_blocks=[config.require("aurora-vpc-network-cidr")],
+    cidr_blocks=[aurora_vpc_cidr],
     security_group_id=vpc.default_security_group_id,
     description="PostgreSQL in from RDS",
 )
 
 aws.ec2.SecurityGroupRule(
-    f"peer-src-sec-grp-rule-egress",
+    "peer-src-sec-grp-rule-egress",
     type="egress",
     from_port=5432,
     to_port=5432,
     protocol="tcp",
-    cidr_blocks=[config.require("aurora-vpc-network-cidr")],
+    cidr_blocks=[aurora_vpc_cidr],
     security_group_id=vpc.default_security_group_id,
     description="PostgreSQL out to RDS",
 )
@@ -158,11 +169,11 @@ aws.ec2.SecurityGroupRule(
 
 # different regions -> separate connection and accepter
 vpc_peering_connection = aws.ec2.VpcPeeringConnection(
-    f"vpc-peering-connection",
+    "vpc-peering-connection",
     vpc_id=vpc.id,
-    peer_vpc_id=config.require("aurora-rds-vpc-id"),
-    peer_owner_id=config.require("aurora-rds-owner-id"),
-    peer_region=config.require("aurora-rds-region"),
+    peer_vpc_id=aurora_vpc_id,
+    peer_owner_id=aurora_owner_id,
+    peer_region=aurora_region,
     auto_accept=False,
     # knwon issue, will fail first: https://github.com/pulumi/pulumi-aws/issues/2248
     # workaround, comment out the requester block then uncomment and re-apply:
@@ -172,18 +183,21 @@ vpc_peering_connection = aws.ec2.VpcPeeringConnection(
     tags={
         "side": "requester",
     },
-    opts=pulumi.ResourceOptions(
-        depends_on=[vpc],
-    ),
 )
 
+# NB: the pulumi engine schedules resource operations by dependency only, not
+# per provider instance, so resources in the Aurora region (accepter, route,
+# security group rules) already run concurrently with the ones in the cluster
+# region. Only the accepter and the route wait on the peering connection; keep
+# it that way rather than splitting this into several providers.
 provider_peer = aws.Provider(
-    f"aurora-rds-region",
-    region=config.require("aurora-rds-region"),
+    "aurora-rds-region",
+    region=aurora_region,
+    **aws_retry_args,
 )
 
 vpc_peering_connection_accepter = aws.ec2.VpcPeeringConnectionAccepter(
-    f"vpc-peering-connection-accepter",
+    "vpc-peering-connection-accepter",
     vpc_peering_connection_id=vpc_peering_connection.id,
     auto_accept=True,
     accepter=aws.ec2.VpcPeeringConnectionAccepterArgs(
@@ -195,12 +209,37 @@ vpc_peering_connection_accepter = aws.ec2.VpcPeeringConnectionAccepter(
     opts=pulumi.ResourceOptions(provider=provider_peer),
 )
 
-public_subnet_ids = []
-nat_gateway_ids = []
-
-# create public subnets that will be used for the AWS Load Balancer Controller
-for n, elem in enumerate(zip(availability_zones, public_subnet_cidrs)):
-    zone, public_subnet_cidr = elem
+@dataclass
+class AvailabilityZone:
+    """Networking resources declared for a single availability zone."""
+
+    zone: str
+    component: pulumi.ComponentResource
+    public_subnet: aws.ec2.Subnet
+    private_subnet: aws.ec2.Subnet
+
+
+def declare_availability_zone(
+    n: int,
+    zone: str,
+    public_subnet_cidr: str,
+    private_subnet_cidr: str,
+) -> AvailabilityZone:
+    """
+    Declare the networking for one availability zone:
+    - a public subnet that will be used for the AWS Load Balancer Controller
+    - a private subnet that has a route to the VPC peering connection and
+      reaches the internet through the NAT gateway in the public subnet
+
+    All resources are grouped under a component for the zone. Nothing in one
+    zone depends on resources of another, so pulumi is free to provision all
+    zones concurrently.
+    """
+    az = pulumi.ComponentResource(
+        "recollect:aws:AvailabilityZone",
+        f"eks-az-{zone}",
+        opts=pulumi.ResourceOptions(parent=vpc),
+    )
 
     public_subnet = aws.ec2.Subnet(
         f"eks-public-subnet-{zone}",
@@ -215,7 +254,12 @@ for n, elem in enumerate(zip(availability_zones, public_subnet_cidrs)):
             cluster_tag: "owned",
             "kubernetes.io/role/elb": "1",
         },
-        opts=pulumi.ResourceOptions(parent=vpc),
+        opts=pulumi.ResourceOptions(
+            parent=az,
+            # Subnets used to be direct children of the VPC; aliasing the old
+            # parent keeps pulumi from replacing them and their children.
+            aliases=[pulumi.Alias(parent=vpc)],
+        ),
     )
 
     eip = aws.ec2.Eip(
@@ -243,7 +287,7 @@ for n, elem in enumerate(zip(availability_zones, public_subnet_cidrs)):
         vpc_id=vpc.id,
         routes=[
             {
-                "cidr_block": config.require("aurora-vpc-network-cidr"),
+                "cidr_block": aurora_vpc_cidr,
                 "vpc_peering_connection_id": vpc_peering_connection.id,
             },
             {"cidr_block": "0.0.0.0/0", "gateway_id": igw.id},
@@ -261,14 +305,6 @@ for n, elem in enumerate(zip(availability_zones, public_subnet_cidrs)):
         opts=pulumi.ResourceOptions(parent=public_route_table),
     )
 
-    nat_gateway_ids.append(nat_gateway.id)
-    public_subnet_ids.append(public_subnet.id)
-
-
-private_subnet_ids = []
-# create private subnets that have routes to the VPC peering connection
-for n, elem in enumerate(zip(availability_zones, private_subnet_cidrs)):
-    zone, private_subnet_cidr = elem
     private_subnet = aws.ec2.Subnet(
         f"eks-private-subnet-{zone}",
         assign_ipv6_address_on_creation=False,
@@ -282,7 +318,11 @@ for n, elem in enumerate(zip(availability_zones, private_subnet_cidrs)):
             cluster_tag: "shared",
             "kubernetes.io/role/internal-elb": "1",
         },
-        opts=pulumi.ResourceOptions(parent=vpc),
+        opts=pulumi.ResourceOptions(
+            parent=az,
+            # See alias note on the public subnet above.
+            aliases=[pulumi.Alias(parent=vpc)],
+        ),
     )
 
     # https://docs.aws.amazon.com/eks/latest/userguide/network_reqs.html
@@ -297,12 +337,12 @@ for n, elem in enumerate(zip(availability_zones, private_subnet_cidrs)):
         vpc_id=vpc.id,
         routes=[
             {
-                "cidr_block": config.require("aurora-vpc-network-cidr"),
+                "cidr_block": aurora_vpc_cidr,
                 "vpc_peering_connection_id": vpc_peering_connection.id,
             },
             {
                 "cidr_block": "0.0.0.0/0",
-                "nat_gateway_id": nat_gateway_ids[n],
+                "nat_gateway_id": nat_gateway.id,
             },
         ],
         tags={
@@ -318,13 +358,29 @@ for n, elem in enumerate(zip(availability_zones, private_subnet_cidrs)):
         opts=pulumi.ResourceOptions(parent=private_route_table),
     )
 
-    private_subnet_ids.append(private_subnet.id)
+    return AvailabilityZone(
+        zone=zone,
+        component=az,
+        public_subnet=public_subnet,
+        private_subnet=private_subnet,
+    )
+
+
+azs = [
+    declare_availability_zone(n, *elem)
+    for n, elem in enumerate(
+        zip(availability_zones, public_subnet_cidrs, private_subnet_cidrs)
+    )
+]
+# Resolved together as a single Output each, rather than as lists of Outputs.
+public_subnet_ids = pulumi.Output.all(*(az.public_subnet.id for az in azs))
+private_subnet_ids = pulumi.Output.all(*(az.private_subnet.id for az in azs))
 
 
 # routing RDS to k8s
 aws.ec2.Route(
     "peer-dst-route",
-    route_table_id=config.require("aurora-routetable-id"),
+    route_table_id=aurora_route_table_id,
     destination_cidr_block=vpc_cidr,
     vpc_peering_connection_id=vpc_peering_connection.id,
     opts=pulumi.ResourceOptions(provider=provider_peer),
@@ -333,60 +389,64 @@ aws.ec2.Route(
 # aurora RDS has security group sg-0e838a95206647b3b
 # attach ingress/egress security group rules
 aws.ec2.SecurityGroupRule(
-    f"peer-dst-sec-grp-rule-ingress",
+    "peer-dst-sec-grp-rule-ingress",
     type="ingress",
     from_port=5432,
     to_port=5432,
     protocol="tcp",
     cidr_blocks=[vpc_cidr],
-    security_group_id=config.require("aurora-securitygroup-id"),
+    security_group_id=aurora_security_group_id,
     description="PostgreSQL in from k8s backend",
     opts=pulumi.ResourceOptions(provider=provider_peer),
 )
 
 aws.ec2.SecurityGroupRule(
-    f"peer-dst-sec-grp-rule-egress",
+    "peer-dst-sec-grp-rule-egress",
     type="egress",
     from_port=5432,
     to_port=5432,
     protocol="tcp",
     cidr_blocks=[vpc_cidr],
-    security_group_id=config.require("aurora-securitygroup-id"),
+    security_group_id=aurora_security_group_id,
     description="PostgreSQL out to k8s backend",
     opts=pulumi.ResourceOptions(provider=provider_peer),
 )
 
 
+# EKS worker node IAM managed policies
+_EKS_WORKER_NODE_POLICY_ARNS = (
+    "arn:aws:iam::aws:policy/AmazonEKSWorkerNodePolicy",
+    "arn:aws:iam::aws:policy/AmazonEKS_CNI_Policy",
+    "arn:aws:iam::aws:policy/AmazonEC2ContainerRegistryReadOnly",
+)
+
+_EC2_ASSUME_ROLE_POLICY = json.dumps(
+    {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Sid": "AllowAssumeRole",
+                "Effect": "Allow",
+                "Principal": {
+                    "Service": "ec2.amazonaws.com",
+                },
+                "Action": "sts:AssumeRole",
+            }
+        ],
+    }
+)
+
+
 # Creates a role and attaches the EKS worker node IAM managed policies
 def create_role(name: str) -> aws.iam.Role:
-    managed_policy_arns = [
-        "arn:aws:iam::aws:policy/AmazonEKSWorkerNodePolicy",
-        "arn:aws:iam::aws:policy/AmazonEKS_CNI_Policy",
-        "arn:aws:iam::aws:policy/AmazonEC2ContainerRegistryReadOnly",
-    ]
-
     role = aws.iam.Role(
         name,
-        assume_role_policy=json.dumps(
-            {
-                "Version": "2012-10-17",
-                "Statement": [
-                    {
-                        "Sid": "AllowAssumeRole",
-                        "Effect": "Allow",
-                        "Principal": {
-                            "Service": "ec2.amazonaws.com",
-                        },
-                        "Action": "sts:AssumeRole",
-                    }
-                ],
-            }
-        ),
+        assume_role_policy=_EC2_ASSUME_ROLE_POLICY,
     )
 
-    for i, policy in enumerate(managed_policy_arns):
+    for policy in _EKS_WORKER_NODE_POLICY_ARNS:
         aws.iam.RolePolicyAttachment(
-            f"{name}_{managed_policy_arns[i].split('/')[-1]}",
+            f"{name}_{policy.split('/')[-1]}",
             policy_arn=policy,
             role=role.id,
         )
@@ -407,6 +467,20 @@ cluster_key = aws.kms.Key(
     },
 )
 
+# IAM users granted cluster admin (system:masters) access
+_CLUSTER_ADMIN_ARNS = (
+    "arn:aws:iam::338164343182:user/andre_prod",
+    "arn:aws:iam::338164343182:user/alicealbrecht_prod",
+    "arn:aws:iam::338164343182:user/mihai_cernusca_prod",
+    "arn:aws:iam::338164343182:user/cicd",
+    "arn:aws:iam::338164343182:user/jonathan_diaz_prod",
+    "arn:aws:iam::338164343182:user/bruno",
+)
+
+_CLUSTER_ADMIN_USER_MAPPINGS = [
+    {"groups": ["system:masters"], "user_arn": arn} for arn in _CLUSTER_ADMIN_ARNS
+]
+
 # Create the EKS cluster
 # TODO - we'll want to introduce a cluster admin role and move away from the direct user mapping
 cluster = eks.Cluster(
@@ -433,25 +507,13 @@ cluster = eks.Cluster(
     skip_default_node_group=True,
     # encryption needs setup, ARN of the Key Management Service (KMS) customer master key
     # https://www.pulumi.com/registry/packages/aws/api-docs/eks/cluster/
-    encryption_config_key_arn=cluster_key.arn.apply(lambda arn: arn),
+    encryption_config_key_arn=cluster_key.arn,
     instance_roles=[compute_role],
-    user_mappings=list(
-        map(
-            lambda arn: {"groups": ["system:masters"], "user_arn": arn},
-            [
-                "arn:aws:iam::338164343182:user/andre_prod",
-                "arn:aws:iam::338164343182:user/alicealbrecht_prod",
-                "arn:aws:iam::338164343182:user/mihai_cernusca_prod",
-                "arn:aws:iam::338164343182:user/cicd",
-                "arn:aws:iam::338164343182:user/jonathan_diaz_prod",
-                "arn:aws:iam::338164343182:user/bruno",
-            ],
-        )
-    ),
+    user_mappings=_CLUSTER_ADMIN_USER_MAPPINGS,
 )
 
 cluster_provider = k8s.Provider(
-    f"eks-provider",
+    "eks-provider",
     enable_server_side_apply=True,
     kubeconfig=cluster.kubeconfig_json,
 )
@@ -462,36 +524,49 @@ cluster_provider = k8s.Provider(
 cluster_oidc_url = cluster.core.oidc_provider.url
 cluster_oidc_arn = cluster.core.oidc_provider.arn
 
+
+def oidc_assume_role_policy(service_account_name: str) -> pulumi.Output[str]:
+    """
+    IAM trust policy allowing the given k8s service account to assume a role
+    through the cluster's OIDC provider.
+    """
+    return aws.iam.get_policy_document_output(
+        statements=[
+            aws.iam.GetPolicyDocumentStatementArgs(
+                effect="Allow",
+                principals=[
+                    aws.iam.GetPolicyDocumentStatementPrincipalArgs(
+                        type="Federated",
+                        identifiers=[cluster_oidc_arn],
+                    )
+                ],
+                actions=["sts:AssumeRoleWithWebIdentity"],
+                conditions=[
+                    aws.iam.GetPolicyDocumentStatementConditionArgs(
+                        test="StringEquals",
+                        variable=pulumi.Output.concat(cluster_oidc_url, ":sub"),
+                        values=[service_account_name],
+                    ),
+                    aws.iam.GetPolicyDocumentStatementConditionArgs(
+                        test="StringEquals",
+                        variable=pulumi.Output.concat(cluster_oidc_url, ":aud"),
+                        values=["sts.amazonaws.com"],
+                    ),
+                ],
+            )
+        ]
+    ).json
+
+
 ebs_service_account_name = "system:serviceaccount:kube-system:ebs-csi-controller-sa"
 
 ebs_role = aws.iam.Role(
-    f"ebs-csi-driver-role",
-    assume_role_policy=pulumi.Output.all(cluster_oidc_arn, cluster_oidc_url).apply(
-        lambda args: json.dumps(
-            {
-                "Version": "2012-10-17",
-                "Statement": [
-                    {
-                        "Effect": "Allow",
-                        "Principal": {
-                            "Federated": args[0],
-                        },
-                        "Action": "sts:AssumeRoleWithWebIdentity",
-                        "Condition": {
-                            "StringEquals": {
-                                f"{args[1]}:sub": ebs_service_account_name,
-                                f"{args[1]}:aud": "sts.amazonaws.com",
-                            }
-                        },
-                    }
-                ],
-            }
-        )
-    ),
+    "ebs-csi-driver-role",
+    assume_role_policy=oidc_assume_role_policy(ebs_service_account_name),
 )
 
 ebs_driver_policy = aws.iam.RolePolicyAttachment(
-    f"ebs-csi-driver-role_AmazonEBSCSIDriverPolicy",
+    "ebs-csi-driver-role_AmazonEBSCSIDriverPolicy",
     role=ebs_role.id,
     policy_arn="arn:aws:iam::aws:policy/service-role/AmazonEBSCSIDriverPolicy",
     opts=pulumi.ResourceOptions(
@@ -500,26 +575,41 @@ ebs_driver_policy = aws.iam.RolePolicyAttachment(
 )
 
 aws_ebs_csi_driver = aws.eks.Addon(
-    f"ebs-csi-driver",
+    "ebs-csi-driver",
     cluster_name=cluster.name,
     addon_name="aws-ebs-csi-driver",
     addon_version="v1.15.0-eksbuild.1",
     service_account_role_arn=ebs_role.arn,
     # resolve_conflicts="PRESERVE", # only for upgrade, not creation
     opts=pulumi.ResourceOptions(
-        depends_on=[cluster, ebs_role],
+        # Cluster and role are implied by the outputs above; the policy
+        # attachment isn't, but the driver is useless without it.
+        depends_on=[ebs_driver_policy],
     ),
 )
 
+# Read-only; shared by all node groups below.
+_NODE_GROUP_TAGS = {"org": "pulumi"}
+
 # https://github.com/pulumi/pulumi-eks/blob/master/examples/managed-nodegroups-py/__main__.py
 #
 # If you are running a stateful application across multiple Availability Zones that
 # is backed by Amazon EBS volumes and using the Kubernetes Cluster Autoscaler,
 # you should configure multiple node groups, each scoped to a single Availability Zone.
 # In addition, you should enable the --balance-similar-node-groups feature.
+#
+# All managed node groups are parented to a single component, so releases that
+# need nodes to be up can depend on the whole fleet instead of on a hand-picked
+# list of node groups.
+node_group_fleet = pulumi.ComponentResource(
+    "recollect:eks:NodeGroupFleet",
+    "all-node-groups",
+    opts=pulumi.ResourceOptions(parent=cluster),
+)
 managed_node_groups = []
-for n, elem in enumerate(zip(availability_zones, public_subnet_ids)):
-    zone, public_subnet_id = elem
+gpu_managed_node_groups = []
+for n, az in enumerate(azs):
+    zone = az.zone
 
     group = eks.ManagedNodeGroup(
         f"compute-managed-ng-{zone}",
@@ -535,16 +625,16 @@ for n, elem in enumerate(zip(availability_zones, public_subnet_ids)):
         disk_size=80,
         instance_types=[cluster_node_instance_type],
         labels={"ondemand": "true"},
-        subnet_ids=[public_subnet_id],
-        tags={"org": "pulumi"},
-        opts=pulumi.ResourceOptions(parent=cluster),
+        subnet_ids=[az.public_subnet.id],
+        tags=_NODE_GROUP_TAGS,
+        opts=pulumi.ResourceOptions(
+            parent=node_group_fleet,
+            # Keep URNs from before node groups were grouped under the fleet.
+            aliases=[pulumi.Alias(parent=cluster)],
+        ),
     )
     managed_node_groups.append(group)
 
-gpu_managed_node_groups = []
-for n, elem in enumerate(zip(availability_zones, public_subnet_ids)):
-    zone, public_subnet_id = elem
-
     if n == 0:
         az_desired_size = 1
         az_min_size = 1
@@ -570,15 +660,18 @@ for n, elem in enumerate(zip(availability_zones, public_subnet_ids)):
         instance_types=[gpu_node_instance_type],
         # labels={"ondemand": "false"},
         labels={"ondemand": "true", "gpu": "true"},
-        tags={"org": "pulumi"},
+        tags=_NODE_GROUP_TAGS,
         # taints=[
         #    aws.eks.NodeGroupTaintArgs(
         #        effect="NO_SCHEDULE", key="dedicated", value="gpu-enabled"
         #    )
         # ],
-        opts=pulumi.ResourceOptions(parent=cluster),
+        opts=pulumi.ResourceOptions(
+            parent=node_group_fleet,
+            aliases=[pulumi.Alias(parent=cluster)],
+        ),
     )
-    gpu_managed_node_groups.append(group)
+    gpu_managed_node_groups.append(gpu_compute_managed_ng)
 
 # provision NVIDIA GPU operator for weaviate and ray
 nvidia_ns = k8s.core.v1.Namespace(
@@ -591,6 +684,30 @@ nvidia_ns = k8s.core.v1.Namespace(
     ),
 )
 
+_GPU_OPERATOR_VALUES = {
+    "version": "v22.9",
+    # NOTE: if updating the toolkit version, it is advised that you create a fresh node group a new operator to go with it
+    # Otherwise, you run the risk of installing over the previous version, and things may be inconsistent
+    "toolkit": {
+        "version": "v1.12.0-centos7",
+    },
+    # https://github.com/NVIDIA/gpu-operator/issues/270
+    # https://github.com/NVIDIA/gpu-operator/blob/master/deployments/gpu-operator/values.yaml#L14
+    "daemonsets": {
+        "tolerations": [
+            {
+                "key": "dedicated",
+                "value": "gpu-enabled",
+                "effect": "NoSchedule",
+            },
+            {
+                "key": "nvidia.com/gpu",
+                "effect": "NoSchedule",
+            },
+        ],
+    },
+}
+
 gpu_operator = Release(
     "nvidia-gpu-operator-op",
     repository_opts=RepositoryOptsArgs(
@@ -598,46 +715,20 @@ gpu_operator = Release(
     ),
     chart="gpu-operator",
     version="v22.9.2",
-    values={
-        "version": "v22.9",
-        # NOTE: if updating the toolkit version, it is advised that you create a fresh node group a new operator to go with it
-        # Otherwise, you run the risk of installing over the previous version, and things may be inconsistent
-        "toolkit": {
-            "version": "v1.12.0-centos7",
-        },
-        # https://github.com/NVIDIA/gpu-operator/issues/270
-        # https://github.com/NVIDIA/gpu-operator/blob/master/deployments/gpu-operator/values.yaml#L14
-        "daemonsets": {
-            "tolerations": [
-                {
-                    "key": "dedicated",
-                    "value": "gpu-enabled",
-                    "effect": "NoSchedule",
-                },
-                {
-                    "key": "nvidia.com/gpu",
-                    "effect": "NoSchedule",
-                },
-            ],
-        },
-    },
+    values=_GPU_OPERATOR_VALUES,
     namespace=nvidia_ns,
     opts=pulumi.ResourceOptions(
-        depends_on=[managed_node_groups[0], gpu_managed_node_groups[0]],
+        depends_on=[node_group_fleet],
         provider=cluster_provider,
-        # Ignore changes to checksum; bug in pulumi-kubernetes; see:
-        # https://github.com/pulumi/pulumi-kubernetes/issues/2649
-        # Remove this once that issue is resolved.
-        ignore_changes=["checksum"],
     ),
 )
 
 ray_managed_ng = eks.ManagedNodeGroup(
-    f"ray-managed-ng",
+    "ray-managed-ng",
     cluster=cluster,
-    subnet_ids=[public_subnet_ids[0]],  # = az us-****-1*; TODO revisit
+    subnet_ids=[azs[0].public_subnet.id],  # = az us-****-1*; TODO revisit
     ami_type="AL2_x86_64",
-    node_group_name=f"ray-managed-ng",
+    node_group_name="ray-managed-ng",
     node_role_arn=compute_role.arn,
     scaling_config=aws.eks.NodeGroupScalingConfigArgs(
         desired_size=1,
@@ -647,11 +738,14 @@ ray_managed_ng = eks.ManagedNodeGroup(
     disk_size=240,
     instance_types=[ray_head_node_instance_type],
     labels={"ondemand": "true", "ray": "true"},
-    tags={"org": "pulumi"},
+    tags=_NODE_GROUP_TAGS,
     taints=[
         aws.eks.NodeGroupTaintArgs(effect="NO_SCHEDULE", key="dedicated", value="ray")
     ],
-    opts=pulumi.ResourceOptions(parent=cluster),
+    opts=pulumi.ResourceOptions(
+        parent=node_group_fleet,
+        aliases=[pulumi.Alias(parent=cluster)],
+    ),
 )
 
 
@@ -665,11 +759,11 @@ ray_managed_ng = eks.ManagedNodeGroup(
 # important: both the weaviate pod with persistent volume claim and the persistent
 # volume the data is in have to be in the same availability zone
 weaviate_import_managed_ng = eks.ManagedNodeGroup(
-    f"weaviate-import-managed-ng",
+    "weaviate-import-managed-ng",
     cluster=cluster,
-    subnet_ids=[public_subnet_ids[1]],  # = az us-west-2b; TODO revisit
+    subnet_ids=[azs[1].public_subnet.id],  # = az us-west-2b; TODO revisit
     ami_type="AL2_x86_64",
-    node_group_name=f"weaviate-import-managed-ng",
+    node_group_name="weaviate-import-managed-ng",
     node_role_arn=compute_role.arn,
     scaling_config=aws.eks.NodeGroupScalingConfigArgs(
         desired_size=1,
@@ -679,13 +773,16 @@ weaviate_import_managed_ng = eks.ManagedNodeGroup(
     disk_size=500,
     instance_types=[weaviate_instance_type],
     labels={"ondemand": "true"},
-    tags={"org": "pulumi"},
+    tags=_NODE_GROUP_TAGS,
     taints=[
         aws.eks.NodeGroupTaintArgs(
             effect="NO_SCHEDULE", key="dedicated", value="weaviate-import"
         )
     ],
-    opts=pulumi.ResourceOptions(parent=cluster),
+    opts=pulumi.ResourceOptions(
+        parent=node_group_fleet,
+        aliases=[pulumi.Alias(parent=cluster)],
+    ),
 )
 
 ns = "weaviate"
@@ -711,29 +808,8 @@ weaviate_bucket = aws.s3.Bucket(
 # name of k8s Service Account to allow Weaviate to speak with the backup bucket
 weaviate_service_account_name = f"system:serviceaccount:{ns}:weaviate-serviceaccount"
 weaviate_role = aws.iam.Role(
-    f"weaviate-role",
-    assume_role_policy=pulumi.Output.all(cluster_oidc_arn, cluster_oidc_url).apply(
-        lambda args: json.dumps(
-            {
-                "Version": "2012-10-17",
-                "Statement": [
-                    {
-                        "Effect": "Allow",
-                        "Principal": {
-                            "Federated": args[0],
-                        },
-                        "Action": "sts:AssumeRoleWithWebIdentity",
-                        "Condition": {
-                            "StringEquals": {
-                                f"{args[1]}:sub": weaviate_service_account_name,
-                                f"{args[1]}:aud": "sts.amazonaws.com",
-                            }
-                        },
-                    }
-                ],
-            }
-        )
-    ),
+    "weaviate-role",
+    assume_role_policy=oidc_assume_role_policy(weaviate_service_account_name),
 )
 
 
@@ -759,11 +835,9 @@ def generate_weaviate_backup_policy_doc(arn):
 
 
 weaviate_backup_policy = aws.iam.RolePolicy(
-    f"weaviate-backup-policy",
+    "weaviate-backup-policy",
     role=weaviate_role,
-    policy=weaviate_bucket.arn.apply(
-        lambda arn: generate_weaviate_backup_policy_doc(arn)
-    ),
+    policy=weaviate_bucket.arn.apply(generate_weaviate_backup_policy_doc),
     opts=pulumi.ResourceOptions(
         parent=weaviate_role,
     ),
@@ -775,7 +849,7 @@ weaviate_service_account = k8s.core.v1.ServiceAccount(
         "name": "weaviate-serviceaccount",
         "namespace": ns,
         "annotations": {
-            "eks.amazonaws.com/role-arn": weaviate_role.arn.apply(lambda arn: arn)
+            "eks.amazonaws.com/role-arn": weaviate_role.arn
         },
     },
 )
@@ -813,6 +887,68 @@ weaviate_transformers_replicas = 0
 #        }
 
 
+# Static (Output-free) part of the weaviate chart values; see the release below
+# for the values that depend on other resources.
+_WEAVIATE_STATIC_VALUES = {
+    "image": {
+        "registry": "docker.io",
+        "tag": "1.22.7",
+        "repo": "semitechnologies/weaviate",
+    },
+    "env": {
+        "CLUSTER_GOSSIP_BIND_PORT": 7000,
+        "CLUSTER_DATA_BIND_PORT": 7001,
+        # The aggressiveness of the Go Garbage Collector. 100 is the default value.
+        "GOGC": 100,
+        # Expose metrics on port 2112 for Prometheus to scrape
+        "PROMETHEUS_MONITORING_ENABLED": True,
+        # Set a MEM limit for the Weaviate Pod so it can help you both increase GC-related
+        # performance as well as avoid GC-related out-of-memory (“OOM”) situations
+        # GOMEMLIMIT: 6GiB
+        # Maximum results Weaviate can query with/without pagination
+        # NOTE: Affects performance, do NOT set to a very high value.
+        # The default is 100K
+        "QUERY_MAXIMUM_RESULTS": 100000,
+        # whether to enable vector dimensions tracking metric
+        "TRACK_VECTOR_DIMENSIONS": False,
+    },
+    "tolerations": [
+        {
+            "key": "dedicated",
+            "value": "weaviate-import",
+            "effect": "NoSchedule",
+        },
+    ],
+    "nodeSelector": {
+        "eks.amazonaws.com/nodegroup": "weaviate-import-managed-ng",
+    },
+    "modules": {
+        "text2vec-contextionary": {
+            "enabled": True,
+        },
+        "text2vec-transformers": {
+            "enabled": weaviate_transformers_enabled,
+            "tag": "sentence-transformers-all-mpnet-base-v2",
+            "repo": "semitechnologies/transformers-inference",
+            "registry": "docker.io",
+            "replicas": weaviate_transformers_replicas,
+            "envconfig": {
+                "enable_cuda": True,
+            },
+            "nodeSelector": {
+                "beta.kubernetes.io/instance-type": gpu_node_instance_type,
+            },
+            "tolerations": [
+                {
+                    "key": "dedicated",
+                    "value": "gpu-enabled",
+                    "effect": "NoSchedule",
+                },
+            ],
+        },
+    },
+}
+
 # S3 backup bucket is specified in ./weaviate/values.yaml
 weaviate = Release(
     "weaviate",
@@ -824,72 +960,16 @@ weaviate = Release(
         ),
         version="16.1.0",
         values={
-            "image": {
-                "registry": "docker.io",
-                "tag": "1.22.7",
-                "repo": "semitechnologies/weaviate",
-            },
-            "env": {
-                "CLUSTER_GOSSIP_BIND_PORT": 7000,
-                "CLUSTER_DATA_BIND_PORT": 7001,
-                # The aggressiveness of the Go Garbage Collector. 100 is the default value.
-                "GOGC": 100,
-                # Expose metrics on port 2112 for Prometheus to scrape
-                "PROMETHEUS_MONITORING_ENABLED": True,
-                # Set a MEM limit for the Weaviate Pod so it can help you both increase GC-related
-                # performance as well as avoid GC-related out-of-memory (“OOM”) situations
-                # GOMEMLIMIT: 6GiB
-                # Maximum results Weaviate can query with/without pagination
-                # NOTE: Affects performance, do NOT set to a very high value.
-                # The default is 100K
-                "QUERY_MAXIMUM_RESULTS": 100000,
-                # whether to enable vector dimensions tracking metric
-                "TRACK_VECTOR_DIMENSIONS": False,
-            },
-            "tolerations": [
-                {
-                    "key": "dedicated",
-                    "value": "weaviate-import",
-                    "effect": "NoSchedule",
-                },
-            ],
-            "nodeSelector": {
-                "eks.amazonaws.com/nodegroup": "weaviate-import-managed-ng",
-            },
+            **_WEAVIATE_STATIC_VALUES,
             "backups": {
                 "s3": {
                     "enabled": True,
                     "envconfig": {
-                        "BACKUP_S3_BUCKET": weaviate_bucket.id.apply(lambda arn: arn),
+                        "BACKUP_S3_BUCKET": weaviate_bucket.id,
                     },
                     "serviceAccountName": "weaviate-serviceaccount",
                 },
             },
-            "modules": {
-                "text2vec-contextionary": {
-                    "enabled": True,
-                },
-                "text2vec-transformers": {
-                    "enabled": weaviate_transformers_enabled,
-                    "tag": "sentence-transformers-all-mpnet-base-v2",
-                    "repo": "semitechnologies/transformers-inference",
-                    "registry": "docker.io",
-                    "replicas": weaviate_transformers_replicas,
-                    "envconfig": {
-                        "enable_cuda": True,
-                    },
-                    "nodeSelector": {
-                        "beta.kubernetes.io/instance-type": gpu_node_instance_type,
-                    },
-                    "tolerations": [
-                        {
-                            "key": "dedicated",
-                            "value": "gpu-enabled",
-                            "effect": "NoSchedule",
-                        },
-                    ],
-                },
-            },
         },
     ),
     opts=pulumi.ResourceOptions(
@@ -897,15 +977,9 @@ weaviate = Release(
         # transformations=[lambda obj: add_custom_annotations(obj, ddog_annotations)],
         depends_on=[
             aws_ebs_csi_driver,
-            managed_node_groups[0],
-            gpu_managed_node_groups[0],
-            weaviate_import_managed_ng,
+            node_group_fleet,
             weaviate_service_account,
         ],
-        # Ignore changes to checksum; bug in pulumi-kubernetes; see:
-        # https://github.com/pulumi/pulumi-kubernetes/issues/2649
-        # Remove this once that issue is resolved.
-        ignore_changes=["checksum"],
     ),
 )
 
@@ -958,11 +1032,7 @@ kuberay = Release(
     namespace=ray_ns,
     opts=pulumi.ResourceOptions(
         provider=cluster_provider,
-        depends_on=[gpu_managed_node_groups[0], managed_node_groups[0]],
-        # Ignore changes to checksum; bug in pulumi-kubernetes; see:
-        # https://github.com/pulumi/pulumi-kubernetes/issues/2649
-        # Remove this once that issue is resolved.
-        ignore_changes=["checksum"],
+        depends_on=[node_group_fleet],
     ),
 )
 
@@ -971,7 +1041,10 @@ kuberay = Release(
 # we have a domain registered with AWS and a hosted zone set up in
 # Route 53, now we have to request an SSL certificate via the
 # AWS certificate manager
-hosted_zone = aws.route53.get_zone(name=config.get("domain"))
+#
+# NB: the _output variant of the lookup doesn't block the program while the
+# zone is fetched, so it overlaps with the registration of other resources.
+hosted_zone = aws.route53.get_zone_output(name=domain)
 
 # "After you write the DNS record or have ACM write the record for you,
 # it typically takes DNS 30 minutes to propagate the record, and
@@ -980,43 +1053,18 @@ hosted_zone = aws.route53.get_zone(name=config.get("domain"))
 # https://us-west-2.console.aws.amazon.com/acm/home?region=us-west-2
 if certificate_arn is None:
     # SSL Cert must be created in us-east-1 unrelated to where the API is deployed.
-    aws_us_east_1 = aws.Provider("aws-provider-us-east-1", region="us-east-1")
-
-    # Request ACM certificate
-    ssl_cert = aws.acm.Certificate(
-        "ssl-cert",
-        domain_name=config.get("domain"),
-        validation_method="DNS",
-        opts=pulumi.ResourceOptions(provider=aws_us_east_1),
-    )
-
-    # Create DNS record to prove to ACM that we own the domain
-    ssl_cert_validation_dns_record = aws.route53.Record(
-        "ssl-cert-validation-dns-record",
+    # Requests the certificate, writes the DNS record proving to ACM that we
+    # own the domain and waits for validation to succeed, all in one step.
+    ssl_cert = acm.DnsValidatedCertificate(
+        f"ssl-cert-{domain}",
+        domain_name=domain,
         zone_id=hosted_zone.id,
-        name=ssl_cert.domain_validation_options.apply(
-            lambda options: options[0].resource_record_name
-        ),
-        type=ssl_cert.domain_validation_options.apply(
-            lambda options: options[0].resource_record_type
-        ),
-        records=[
-            ssl_cert.domain_validation_options.apply(
-                lambda options: options[0].resource_record_value
-            ),
-        ],
-        ttl=10 * 60,
-    )
-
-    # Wait for the certificate validation to succeed
-    validated_ssl_certificate = aws.acm.CertificateValidation(
-        f"ssl-cert-validation-{config.get('domain')}",
-        certificate_arn=ssl_cert.arn,
-        validation_record_fqdns=[ssl_cert_validation_dns_record.fqdn],
-        opts=pulumi.ResourceOptions(provider=aws_us_east_1),
+        region="us-east-1",
+        profile=aws_config.get("profile"),
+        **aws_retry_args,
     )
 
-    certificate_arn = validated_ssl_certificate.certificate_arn
+    certificate_arn = ssl_cert.certificate_arn
 
 # external-dns
 #
@@ -1043,55 +1091,35 @@ external_dns_ns = k8s.core.v1.Namespace(
 # https://github.com/kubernetes-sigs/external-dns/blob/master/docs/tutorials/aws.md#iam-permissions
 edns_service_account_name = f"system:serviceaccount:{ns}:external-dns-serviceaccount"
 
-edns_role = aws.iam.Role(
-    f"external-dns-role",
-    assume_role_policy=pulumi.Output.all(cluster_oidc_arn, cluster_oidc_url).apply(
-        lambda args: json.dumps(
-            {
-                "Version": "2012-10-17",
-                "Statement": [
-                    {
-                        "Effect": "Allow",
-                        "Principal": {
-                            "Federated": args[0],
-                        },
-                        "Action": "sts:AssumeRoleWithWebIdentity",
-                        "Condition": {
-                            "StringEquals": {
-                                f"{args[1]}:sub": edns_service_account_name,
-                                f"{args[1]}:aud": "sts.amazonaws.com",
-                            }
-                        },
-                    }
-                ],
-            }
-        )
-    ),
+edns_policy_doc = aws.iam.get_policy_document_output(
+    statements=[
+        aws.iam.GetPolicyDocumentStatementArgs(
+            effect="Allow",
+            actions=["route53:ChangeResourceRecordSets"],
+            resources=["arn:aws:route53:::hostedzone/*"],
+        ),
+        aws.iam.GetPolicyDocumentStatementArgs(
+            effect="Allow",
+            actions=[
+                "route53:ListHostedZones",
+                "route53:ListResourceRecordSets",
+            ],
+            resources=["*"],
+        ),
+    ]
 )
 
-policy_doc = {
-    "Version": "2012-10-17",
-    "Statement": [
-        {
-            "Effect": "Allow",
-            "Action": ["route53:ChangeResourceRecordSets"],
-            "Resource": ["arn:aws:route53:::hostedzone/*"],
-        },
-        {
-            "Effect": "Allow",
-            "Action": ["route53:ListHostedZones", "route53:ListResourceRecordSets"],
-            "Resource": ["*"],
-        },
+# Inline on the role itself, rather than a separate RolePolicy resource that
+# can only be created once the role exists.
+edns_role = aws.iam.Role(
+    "external-dns-role",
+    assume_role_policy=oidc_assume_role_policy(edns_service_account_name),
+    inline_policies=[
+        aws.iam.RoleInlinePolicyArgs(
+            name="external-dns-policy",
+            policy=edns_policy_doc.json,
+        ),
     ],
-}
-
-edns_policy = aws.iam.RolePolicy(
-    f"external-dns-policy",
-    role=edns_role,
-    policy=json.dumps(policy_doc),
-    opts=pulumi.ResourceOptions(
-        parent=edns_role,
-    ),
 )
 
 k8s.core.v1.ServiceAccount(
@@ -1100,7 +1128,7 @@ k8s.core.v1.ServiceAccount(
         "name": "external-dns-serviceaccount",
         "namespace": ns,
         "annotations": {
-            "eks.amazonaws.com/role-arn": edns_role.arn.apply(lambda arn: arn)
+            "eks.amazonaws.com/role-arn": edns_role.arn,
         },
     },
 )
@@ -1123,11 +1151,18 @@ k8s.core.v1.ServiceAccount(
 # - replicas: 1
 # + replicas: 3
 
-external_dns = k8s.helm.v3.Chart(
+# A single helm Release rather than a client-side expanded Chart: helm does
+# the reconciliation, so pulumi diffs one resource instead of every manifest
+# in the chart. external-dns has no readiness other resources depend on, so
+# don't wait for its pods either.
+external_dns = Release(
     "external-dns",
-    k8s.helm.v3.ChartOpts(
+    ReleaseArgs(
         chart="external-dns",
-        namespace=ns,
+        namespace=external_dns_ns.metadata.name,
+        repository_opts=RepositoryOptsArgs(
+            repo="https://charts.bitnami.com/bitnami",
+        ),
         values={
             "serviceAccount": {
                 "name": "external-dns-serviceaccount",
@@ -1139,11 +1174,11 @@ external_dns = k8s.helm.v3.Chart(
             "metrics.enabled": "false",
             "aws.zoneType": "public",
             "txtOwnerId": hosted_zone.id,
-            "domainFilters": [config.get("domain")],
+            "domainFilters": [domain],
         },
-        fetch_opts=k8s.helm.v3.FetchOpts(repo="https://charts.bitnami.com/bitnami"),
+        skip_await=True,
     ),
-    pulumi.ResourceOptions(
+    opts=pulumi.ResourceOptions(
         provider=cluster_provider,
         parent=external_dns_ns,
     ),
@@ -1163,6 +1198,10 @@ fireworks_cfg = {
     "FIREWORKS_ENDPOINTS_CLOUD_URL": config.require("fireworks-endpoints-cloud-url"),
 }
 
+anyscale_cfg = {
+    "ANYSCALE_ENDPOINTS_CLOUD_URL": config.require("anyscale-endpoints-cloud-url"),
+}
+
 fireworks_secrets = {
     "FIREWORKS_ENDPOINTS_API_KEY": to_k8s_secret(config, "fireworks-endpoints-api-key"),
 }
@@ -1176,10 +1215,9 @@ ray_secret_map = k8s.core.v1.Secret(
     },
     metadata={
         "name": "ray-secrets",
-        "namespace": "ray",
+        "namespace": ray_ns.metadata.name,
     },
     opts=pulumi.ResourceOptions(
-        depends_on=[cluster],
         provider=cluster_provider,
     ),
 )
@@ -1187,16 +1225,15 @@ ray_secret_map = k8s.core.v1.Secret(
 ray_config_map = k8s.core.v1.ConfigMap(
     "ray-config",
     data={
-        "LLM_PROVIDER": config.require("llm-provider"),
+        "LLM_PROVIDER": llm_provider,
         **anyscale_cfg,
         **fireworks_cfg,
     },
     metadata={
         "name": "ray-config",
-        "namespace": "ray",
+        "namespace": ray_ns.metadata.name,
     },
     opts=pulumi.ResourceOptions(
-        depends_on=[cluster],
         provider=cluster_provider,
     ),
 )
@@ -1272,24 +1309,6 @@ google_secrets = {
 }
 
 
-SECRET_KEYS = [
-    "POSTGRESQL_PASSWORD",
-    "POSTGRESQL_USER",
-]
-
-
-def get_secret(config_map: k8s.core.v1.Secret, key: str) -> k8s.core.v1.EnvVarArgs:
-    return k8s.core.v1.EnvVarArgs(
-        name=key,
-        value_from=k8s.core.v1.EnvVarSourceArgs(
-            secret_key_ref=k8s.core.v1.SecretKeySelectorArgs(
-                name=config_map._name,
-                key=key,
-            )
-        ),
-    )
-
-
 if config.get_bool("devdb-enabled") or False:
     # NB: see note in dev_db about 'prod-clone' naming convention here.
     db_subnet_group = aws.rds.SubnetGroup(
@@ -1308,7 +1327,7 @@ if config.get_bool("devdb-enabled") or False:
     # This is NOT BEST PRACTICES, but Pulumi / AWS was making it near impossible to reference
     # the cluster SGs.  We'll want to address this.
     aws.ec2.SecurityGroupRule(
-        f"eks-to-rds-sg",
+        "eks-to-rds-sg",
         type="ingress",
         from_port=5432,
         to_port=5432,
@@ -1356,129 +1375,30 @@ internal_config_map = k8s.core.v1.ConfigMap(
     "backend-config-internal",
     data={
         "ENV": env,
-        # Required by alembic migrations
         **pgsql_cfg,
     },
     metadata={
         "name": "backend-config-internal",
-        "namespace": ns,
-    },
-    opts=pulumi.ResourceOptions(
-        depends_on=[cluster],
-        provider=cluster_provider,
-    ),
-)
-
-internal_secret_map = k8s.core.v1.Secret(
-    "backend-secrets-internal",
-    data={
-        # Required for alembic migrations
-        **pgsql_secrets,
-    },
-    metadata={
-        "name": "backend-secrets-internal",
-        "namespace": ns,
+        "namespace": internal_ns.metadata.name,
     },
     opts=pulumi.ResourceOptions(
-        depends_on=[cluster],
         provider=cluster_provider,
     ),
 )
 
 
-# https://www.pulumi.com/blog/build-publish-containers-iac/#authenticate-with-temporary-ecr-access-token
-def getRegistryInfo(rid):
-    creds = aws.ecr.get_credentials(registry_id=rid)
-    decoded = base64.b64decode(creds.authorization_token).decode()
-    parts = decoded.split(":")
-    if len(parts) != 2:
-        raise Exception("Invalid credentials")
-    return {
-        "server": creds.proxy_endpoint,
-        "username": parts[0],
-        "password": parts[1],
-    }
-
-
 internal_provider = k8s.Provider(
-    f"internal-provider",
+    "internal-provider",
     enable_server_side_apply=False,
     kubeconfig=cluster.kubeconfig_json,
     namespace="internal",
 )
 
 
-def define_migration_job(
-    provider: k8s.Provider = internal_provider,
-    config_map: k8s.core.v1.ConfigMap = internal_config_map,
-    secret_map: k8s.core.v1.Secret = internal_secret_map,
-) -> k8s.batch.v1.Job:
-    name = "alembic"
-    repo = aws.ecr.Repository(name, force_delete=True)
-    image_name = repo.repository_url
-    registry_info = repo.registry_id.apply(getRegistryInfo)
-
-    image = Image(
-        name,
-        image_name=image_name,
-        registry=registry_info,
-        build=DockerBuildArgs(
-            builder_version=BuilderVersion.BUILDER_BUILD_KIT,
-            context="./",
-            dockerfile="./infra/pgsql/alembic.Dockerfile",
-            platform="linux/amd64",
-            args={"BUILDKIT_INLINE_CACHE": "1"},
-        ),
-        skip_push=False,
-    )
-
-    job = k8s.batch.v1.Job(
-        name,
-        metadata=k8s.meta.v1.ObjectMetaArgs(
-            name=name,
-            labels={"image-sha": image_sha(image.repo_digest)},
-        ),
-        spec=k8s.batch.v1.JobSpecArgs(
-            backoff_limit=4,
-            template=k8s.core.v1.PodTemplateSpecArgs(
-                metadata=k8s.meta.v1.ObjectMetaArgs(
-                    labels={"app": name},  # | datadog_labels(env, name),
-                ),
-                spec=k8s.core.v1.PodSpecArgs(
-                    containers=[
-                        k8s.core.v1.ContainerArgs(
-                            image=image.image_name,
-                            name=name,
-                            image_pull_policy="Always",
-                            env_from=[
-                                k8s.core.v1.EnvFromSourceArgs(
-                                    config_map_ref=k8s.core.v1.ConfigMapEnvSourceArgs(
-                                        name=config_map.metadata.name,
-                                    )
-                                )
-                            ],
-                            env=[
-                                *(get_secret(secret_map, x) for x in SECRET_KEYS),
-                            ],
-                        )
-                    ],
-                    restart_policy="Never",
-                ),
-            ),
-        ),
-        opts=pulumi.ResourceOptions(
-            provider=provider,
-            delete_before_replace=True,
-            depends_on=[image],
-            replace_on_changes=["metadata.labels"],
-        ),
-    )
-    return job
-
-
-# The alembic job needs to run before any other services/endpoints/apps get
-# updated, since they will depend on the DBs being already updated
-alembic_job = define_migration_job()
+# One repository per image name, however many times it's asked for.
+@functools.lru_cache(maxsize=None)
+def ecr_repository(name: str) -> aws.ecr.Repository:
+    return aws.ecr.Repository(name, force_delete=True)
 
 
 def define_daemon_set(
@@ -1488,22 +1408,22 @@ def define_daemon_set(
     tolerations=[],
     node_selector={},
 ):
-    repo = aws.ecr.Repository(name, force_delete=True)
+    repo = ecr_repository(name)
     image_name = repo.repository_url
-    registry_info = repo.registry_id.apply(getRegistryInfo)
 
     image = Image(
         name,
         image_name=image_name,
-        registry=registry_info,
+        registry=registry_credentials(),
         build=DockerBuildArgs(
             builder_version=BuilderVersion.BUILDER_BUILD_KIT,
             context="src",
             dockerfile=os.path.abspath(f"src/{name}.Dockerfile"),
             platform="linux/amd64",
-            # cache_from=CacheFromArgs(
-            #    images=[image_name.apply(lambda x: f"{x}:latest")]
-            # ),
+            # Reuse layers from the last pushed image (inline cache).
+            cache_from=CacheFromArgs(
+                images=[image_name.apply(lambda x: f"{x}:latest")]
+            ),
             args={"BUILDKIT_INLINE_CACHE": "1"},
         ),
         skip_push=False,
@@ -1535,8 +1455,8 @@ def define_daemon_set(
                     containers=[
                         k8s.core.v1.ContainerArgs(
                             name=name,
-                            image=image.image_name.apply(lambda x: x),
-                            image_pull_policy="Always",
+                            image=image.repo_digest,
+                            image_pull_policy="IfNotPresent",
                             stdin=True,
                             tty=True,
                             env_from=[
@@ -1562,6 +1482,7 @@ def define_daemon_set(
 # annotated pods in the cluster and sending them to DataDog.
 #
 # See `datadog_labels` and `datadog_annotations` for details.
+# (re-add the import from infra.datadog.agent when re-enabling)
 # declare_datadog_cluster_agent(
 #    api_key=config.require_secret("datadog-api-key"),
 #    cluster=cluster,
@@ -1573,6 +1494,7 @@ aws_region = aws_config.require("region")
 aws_provider = aws.Provider(
     f"aws-provider-{aws_region}",
     region=aws_region,
+    **aws_retry_args,
 )
 
 # NB(bruno): This is hackyAF... The cluster creation declaration should have
@@ -1607,11 +1529,21 @@ worker_image = declare_image_in_ecr(
     dockerfile="./infra/workers/worker.Dockerfile",
 ).image
 
-server_image = declare_image_in_ecr(
+server = declare_image_in_ecr(
     name="server",
     aws_provider=aws_provider,
     dockerfile="./infra/http_servers/http_server.Dockerfile",
-).image
+)
+server_image = server.image
+
+# DB migrations run as an init container of the API server (see below), so the
+# image is hosted next to the server's rather than in a repo of its own.
+alembic_image = declare_image_in_repo(
+    name="alembic",
+    repo=server.repo,
+    dockerfile="./infra/pgsql/alembic.Dockerfile",
+    tag="alembic",
+)
 
 # --- Cognito IDP setup
 
@@ -1632,6 +1564,29 @@ account_deletions = declare_queue_with_dlq(
 # TODO: this bucket should be managed by pulumi
 userfiles_bucket_name = config.require("user-files-bucket")
 
+# Settings shared by the public and private app zones, merged once here.
+common_app_cfg = {
+    "ENV": env,
+    **pgsql_cfg,
+    **weaviate_cfg,
+    **neo4j_cfg,
+    **fireworks_cfg,
+    "LLM_PROVIDER": llm_provider,
+    "S3_BUCKET_USERFILES": userfiles_bucket_name,
+    "COGNITO_USERPOOL_ID": user_pool.id,
+    **twitter_cfg,
+    **google_cfg,
+}
+
+common_app_secrets = {
+    **pgsql_secrets,
+    **sendgrid_secrets,
+    **launchdarkly_secrets,
+    **neo4j_secrets,
+    **fireworks_secrets,
+    **google_secrets,
+}
+
 # --- Public app zone ---------------------------------------------------------
 # Apps exposed to inbound traffic from the internet.
 
@@ -1639,31 +1594,17 @@ public_app_zone = declare_app_zone(
     name="public",
     cluster=cluster,
     config_kv_pairs={
-        "ENV": env,
-        **pgsql_cfg,
-        **weaviate_cfg,
-        **neo4j_cfg,
-        **fireworks_cfg,
-        "LLM_PROVIDER": config.require("llm-provider"),
+        **common_app_cfg,
         "DEFAULT_EMBEDDING_ENGINE": config.require("default-embedding-engine"),
-        "S3_BUCKET_USERFILES": userfiles_bucket_name,
-        "COGNITO_USERPOOL_ID": user_pool.id,
         "COGNITO_REGION": config.require("cognito-region"),
         "COGNITO_APP_CLIENT_ID": config.require("cognito-app-client-id"),
         "ALLOW_ORIGINS": ",".join(config.require_object("allow-origins")),
         "ALLOW_ADMIN": ",".join(config.require_object("allow-admin")),
-        **twitter_cfg,
-        **google_cfg,
     },
     secret_kv_pairs={
-        **pgsql_secrets,
-        **sendgrid_secrets,
-        **launchdarkly_secrets,
-        **neo4j_secrets,
-        **fireworks_secrets,
+        **common_app_secrets,
         # TODO: Drop these in favor of IAM policies attached to service accounts.
         **s3_secrets,
-        **google_secrets,
     },
 )
 
@@ -1674,9 +1615,14 @@ declare_http_server(
     env=env,
     dockerfile_or_image=server_image,
     replicas=2 if env == "prod" else 1,
+    # Migrations must be applied before the API starts serving requests
+    # against the new schema. Replicas starting together take turns on an
+    # advisory lock (see migrations/pgsql/env.py); the later ones find the
+    # schema at head and do nothing.
+    init_images={"alembic": alembic_image},
     exposed_as=PublicHttpServer(
         subdomains=["api", "backend"],
-        domain=config.require("domain"),  # e.g. "staging.re-collect.cloud"
+        domain=domain,
         certificate_arn=certificate_arn,
     ),
     is_allowed_to=[
@@ -1691,26 +1637,12 @@ private_app_zone = declare_app_zone(
     name="private",
     cluster=cluster,
     config_kv_pairs={
-        "ENV": env,
-        **pgsql_cfg,
-        **weaviate_cfg,
-        **neo4j_cfg,
-        **fireworks_cfg,
-        "LLM_PROVIDER": config.require("llm-provider"),
-        "S3_BUCKET_USERFILES": userfiles_bucket_name,
-        "COGNITO_USERPOOL_ID": user_pool.id,
+        **common_app_cfg,
         "PDF_MAX_FILE_SIZE_IN_MIB": config.get("pdf-max-file-size-in-mib") or "10",
-        **twitter_cfg,
-        **google_cfg,
     },
     secret_kv_pairs={
-        **pgsql_secrets,
-        **sendgrid_secrets,
-        **launchdarkly_secrets,
-        **neo4j_secrets,
-        **fireworks_secrets,
+        **common_app_secrets,
         **twitter_secrets,
-        **google_secrets,
     },
 )
 
@@ -1,16 +1,17 @@
 # -*- coding: utf-8 -*-
+import atexit
 import itertools
 import os
+import selectors
 import signal
 import subprocess
 import sys
-import threading
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 # Script to run multiple workers in parallel as sub-processes. Blocks until all
-# sub-processes have exited. Sends SIGTERM to all workers on SIGINT, and
-# SIGKILL on second SIGINT.
+# sub-processes have exited. Sends SIGTERM to all workers on SIGINT (or SIGTERM,
+# SIGHUP), and SIGKILL on the second one.
 #
 # NB(bruno): my bash foo wasn't strong enough to make this happen in a script
 # that worked well across macos and linux. Python it is ¯\_(ツ)_/¯
@@ -30,53 +31,88 @@ _COLOR_RESET = 0
 
 
 def _log(msg: str) -> None:
-    print(msg)
+    # Flushed right away, since worker output goes straight to stdout's
+    # underlying buffer (see SubprocRunner._log).
+    print(msg, flush=True)
+
+
+# Max bytes of subprocess output read at once.
+_READ_SIZE = 64 * 1024
 
 
 class SubprocRunner:
-    _proc: Optional[subprocess.Popen[str]] = None
+    _proc: Optional[subprocess.Popen[bytes]] = None
 
     def __init__(self, name: str, color: Color, cmd: list[str]) -> None:
         self.name = name
         self.color = color
         self.cmd = cmd
+        # Prepended to every line of output; built once, it doesn't change.
+        self._prefix = f"\033[{color.value}m[{name}] \033[{_COLOR_RESET}m".encode()
+        # Output read so far that doesn't end in a newline yet.
+        self._tail = b""
 
-    def run(self) -> None:
-        if self._proc is not None:
-            return None
+    def start(self) -> int:
+        """Start the subprocess; returns the fd its output can be read from."""
+        assert self._proc is None
 
         self._proc = subprocess.Popen(
             self.cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
             preexec_fn=os.setpgrp,
         )
 
         _log(f"🚀 Subprocess {self.name} running (pid={self._proc.pid}).")
-        while True:
-            assert self._proc.stdout is not None
-            output = self._proc.stdout.readline()
-            if output == "" and self._proc.poll() is not None:
-                break
-            if output:
-                self._log(output.strip())
-
+        assert self._proc.stdout is not None
+        return self._proc.stdout.fileno()
+
+    def read(self) -> bool:
+        """
+        Log whatever output the subprocess has produced. Only call once its fd
+        is readable, so this doesn't block.
+
+        Returns False once the output has ended and the subprocess has exited.
+        """
+        assert self._proc is not None and self._proc.stdout is not None
+        chunk = os.read(self._proc.stdout.fileno(), _READ_SIZE)
+        *lines, self._tail = (self._tail + chunk).split(b"\n")
+        if not chunk and self._tail:
+            lines.append(self._tail)  # unterminated last line
+        self._log(line.strip() for line in lines)
+        if chunk:
+            return True
+
+        self._proc.wait()
         emoji = "🟢" if self._proc.returncode == 0 else "🔴"
         _log(f"{emoji} Subprocess {self.name} exited with code {self._proc.returncode}")
-
-    def stop(self, kill: bool = False) -> None:
-        if self._proc is None:
+        return False
+
+    def signal(self, kill: bool = False) -> None:
+        """
+        Send SIGTERM (or SIGKILL) to the subprocess' process group, without
+        waiting for it to exit; read() reaps it once its output is drained.
+        """
+        if self._proc is None or self._proc.poll() is not None:
             return None
 
-        if kill:
-            self._proc.kill()
-        else:
-            self._proc.terminate()
-            self._proc.wait()
-
-    def _log(self, msg: str) -> None:
-        print(f"\033[{self.color.value}m[{self.name}] \033[{_COLOR_RESET}m{msg}")
+        # Each worker runs in its own process group (see preexec_fn above), so
+        # signal the whole group: `poetry run` and anything the worker spawns.
+        try:
+            os.killpg(
+                os.getpgid(self._proc.pid),
+                signal.SIGKILL if kill else signal.SIGTERM,
+            )
+        except ProcessLookupError:
+            pass  # exited in the meantime
+
+    def _log(self, lines: Iterable[bytes]) -> None:
+        # Output is passed through as bytes, in one write per chunk read; no
+        # need to decode it just to print it.
+        sys.stdout.buffer.write(
+            b"".join(self._prefix + line + b"\n" for line in lines if line)
+        )
+        sys.stdout.buffer.flush()
 
 
 sigints: int = 0
@@ -84,18 +120,26 @@ subprocs: list[SubprocRunner] = []
 
 
 def stop_subprocs(sig: int, _: Any) -> None:
-    """Handle SIGINT signal by sending SIGTERM or SIGKILL to child processes."""
+    """Handle SIGINT/SIGTERM/SIGHUP by sending SIGTERM or SIGKILL to child processes."""
     global sigints
     sigints += 1
     if sigints > 1:
         _log("\n🪓 Sending SIGKILL to workers...")
         for process in subprocs:
-            process.stop(kill=True)
+            process.signal(kill=True)
         sys.exit(1)
     else:
         _log("\n✋ Sending SIGTERM to workers (ctrl+c again to send SIGKILL)...")
+        # Signal all workers first so they shut down concurrently; the main
+        # loop below keeps draining their output until they exit.
         for process in subprocs:
-            process.stop()
+            process.signal()
+
+
+def kill_remaining_subprocs() -> None:
+    """Last resort: don't leave workers running if we exit for any other reason."""
+    for process in subprocs:
+        process.signal(kill=True)
 
 
 if __name__ == "__main__":
@@ -106,9 +150,17 @@ if __name__ == "__main__":
     # Install SIGINT handler to send SIGTERM to child processes.
     # This'll prevent KeyboardInterrupt from raising below.
     signal.signal(signal.SIGINT, stop_subprocs)
+    # Same for SIGTERM/SIGHUP (e.g. `kill <pid>`, closed terminal): by default
+    # they'd exit this process right away, leaving workers running since they
+    # are in their own process groups.
+    signal.signal(signal.SIGTERM, stop_subprocs)
+    signal.signal(signal.SIGHUP, stop_subprocs)
+    atexit.register(kill_remaining_subprocs)
 
     workers: list[str] = sys.argv[1:]
-    threads: list[threading.Thread] = []
+    # A single loop multiplexes the output of all workers, logging it as it
+    # arrives, rather than one thread per worker blocking on its output.
+    selector = selectors.DefaultSelector()
 
     color_cycle = itertools.cycle([color for color in Color])
     try:
@@ -119,10 +171,10 @@ if __name__ == "__main__":
                 ["poetry", "run", "python3", "-u", "-m", f"workers.{worker}"],
             )
             subprocs.append(runner)
-            thread = threading.Thread(target=runner.run)
-            threads.append(thread)
-            thread.start()
-        for thread in threads:
-            thread.join()
+            selector.register(runner.start(), selectors.EVENT_READ, runner)
+        while selector.get_map():
+            for key, _ in selector.select():
+                if not key.data.read():
+                    selector.unregister(key.fd)
     except KeyboardInterrupt:
         pass
@@ -36,6 +36,11 @@ def declare_app_zone(
     foundation for future work where we can restrict e.g. communication between
     apps in different app zones, outbound access, etc.
 
+    Each zone gets exactly one ConfigMap and one Secret, which all of its apps
+    mount via envFrom. These are namespaced (pods can't reference them across
+    namespaces), so settings shared between zones are necessarily copied into
+    each zone's own ConfigMap/Secret rather than split out into shared ones.
+
     Args:
         name (str): The name of the AppZone.
         cluster (pulumi_eks.Cluster): The EKS cluster to create the AppZone in.
@@ -123,7 +128,8 @@ def declare_app(
     dockerfile_or_image: docker.Image | str,
     replicas: int = 1,
     env_overrides: dict[str, str] = {},
-    is_allowed_to: list[pulumi.Output[iam.PolicyStatement]] = [],
+    is_allowed_to: list[pulumi.Output[iam.PolicyStatement] | iam.PolicyStatement] = [],
+    init_images: dict[str, docker.Image] = {},
 ) -> App:
     """
     Declare an application to run in the cluster.
@@ -151,9 +157,13 @@ def declare_app(
             application. Defaults to 1.
         env_overrides (dict[str, str], optional): A dictionary of environment
             variables to override. Defaults to {}.
-        is_allowed_to (list[pulumi.Output[iam.PolicyStatement]], optional):
-            A list of IAM policy statements that define the permissions granted
-            to the application. Defaults to [].
+        is_allowed_to (list[pulumi.Output[...] | iam.PolicyStatement], optional):
+            A list of IAM policy statements (plain or as outputs) that define the
+            permissions granted to the application. Defaults to [].
+        init_images (dict[str, docker.Image], optional): Images to run to
+            completion, in order, as init containers before the app starts
+            (e.g. database migrations), keyed by container name. They get the
+            same ConfigMap/Secret environment as the app. Defaults to {}.
     """
 
     # Create a service account that'll be attached to the deployment for the
@@ -178,6 +188,20 @@ def declare_app(
             dockerfile=dockerfile_or_image,  # dockerfile
         ).image
 
+    # Both app and init containers get their environment from the zone.
+    env_from = [
+        k8s.core.v1.EnvFromSourceArgs(
+            config_map_ref=k8s.core.v1.ConfigMapEnvSourceArgs(
+                name=zone.config_map.metadata.name,
+            )
+        ),
+        k8s.core.v1.EnvFromSourceArgs(
+            secret_ref=k8s.core.v1.SecretEnvSourceArgs(
+                name=zone.secrets.metadata.name,
+            )
+        ),
+    ]
+
     # Finally, declare the deployment for this app, with the service account
     # created above attached to it (so pods can access necessary AWS resources).
     deployment = k8s.apps.v1.Deployment(
@@ -212,29 +236,37 @@ def declare_app(
                         # built, which will result in a deployment update (and
                         # the consequent rolling restart of pods).
                         "image-sha": image_sha(image.repo_digest),
+                        # Same for init containers, which may be built from
+                        # sources that don't affect the app image.
+                        **{
+                            f"{init_name}-image-sha": image_sha(
+                                init_image.repo_digest
+                            )
+                            for init_name, init_image in init_images.items()
+                        },
                     },
                 ),
                 spec=k8s.core.v1.PodSpecArgs(
                     service_account_name=service_account.metadata.name,
+                    init_containers=[
+                        k8s.core.v1.ContainerArgs(
+                            name=init_name,
+                            image=init_image.repo_digest,
+                            image_pull_policy="IfNotPresent",
+                            env_from=env_from,
+                        )
+                        for init_name, init_image in init_images.items()
+                    ],
                     containers=[
                         k8s.core.v1.ContainerArgs(
                             name=res_name,
-                            image=image.image_name,
-                            image_pull_policy="Always",
+                            # Pinned by digest, so nodes that already have
+                            # this exact image needn't ask ECR for it again.
+                            image=image.repo_digest,
+                            image_pull_policy="IfNotPresent",
                             stdin=True,
                             tty=True,
-                            env_from=[
-                                k8s.core.v1.EnvFromSourceArgs(
-                                    config_map_ref=k8s.core.v1.ConfigMapEnvSourceArgs(
-                                        name=zone.config_map.metadata.name,
-                                    )
-                                ),
-                                k8s.core.v1.EnvFromSourceArgs(
-                                    secret_ref=k8s.core.v1.SecretEnvSourceArgs(
-                                        name=zone.secrets.metadata.name,
-                                    )
-                                ),
-                            ],
+                            env_from=env_from,
                             env=[
                                 k8s.core.v1.EnvVarArgs(name=key, value=value)
                                 for key, value in env_overrides.items()
@@ -249,6 +281,7 @@ def declare_app(
             parent=zone.namespace,  # top-level under namespace
             depends_on=[
                 image,
+                *init_images.values(),
                 service_account,
             ],
         ),
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+import time
+from typing import Any, Optional
+
+import boto3
+import botocore.config
+import pulumi
+import pulumi.dynamic
+
+# ACM can take up to ~30 minutes to validate a certificate once the DNS
+# record is visible. Poll every 30s for up to 30 minutes.
+_WAITER_DELAY_SECONDS = 30
+_WAITER_MAX_ATTEMPTS = 60
+
+# The validation record of a freshly requested certificate shows up within
+# seconds, but isn't part of the RequestCertificate response.
+_RECORD_POLL_DELAY_SECONDS = 5
+_RECORD_POLL_MAX_ATTEMPTS = 24
+
+# ACM only needs to resolve the record once; keep stale answers short-lived.
+_RECORD_TTL_SECONDS = 60
+
+# Properties set by the program that define the certificate (changing any of
+# them requests a new one); the rest are AWS client settings or outputs.
+_INPUTS = ("domain_name", "zone_id", "region")
+
+
+class ValidationRecordNotFound(Exception):
+    def __init__(self, arn: str):
+        self.arn = arn
+        super().__init__(f"no DNS validation record for {arn}")
+
+
+def _client(props: dict[str, Any], service: str, region: Optional[str] = None) -> Any:
+    """
+    A boto3 client configured like the stack's AWS providers. Dynamic providers
+    run outside of the pulumi-aws provider, so its profile and retry settings
+    are passed in as properties.
+    """
+    retries: dict[str, Any] = {}
+    if props.get("max_retries") is not None:
+        retries["max_attempts"] = props["max_retries"]
+    if props.get("retry_mode") is not None:
+        retries["mode"] = props["retry_mode"]
+
+    session = boto3.Session(profile_name=props.get("profile"))
+    return session.client(
+        service,
+        region_name=region,
+        config=botocore.config.Config(retries=retries),
+    )
+
+
+class _DnsValidatedCertificateProvider(pulumi.dynamic.ResourceProvider):
+    """
+    Requests an ACM certificate for a domain, writes its DNS validation record
+    to the given Route 53 hosted zone and waits (with boto3's ACM
+    `certificate_validated` waiter) until the certificate is issued.
+    """
+
+    def create(self, props: dict[str, Any]) -> pulumi.dynamic.CreateResult:
+        acm = _client(props, "acm", region=props["region"])
+        route53 = _client(props, "route53")
+        arn = acm.request_certificate(
+            DomainName=props["domain_name"],
+            ValidationMethod="DNS",
+        )["CertificateArn"]
+
+        # A failed create records no resource id, so nothing would ever delete
+        # the certificate or its record: clean them up before failing.
+        record: Optional[dict[str, str]] = None
+        try:
+            record = self._validation_record(acm, arn)
+            self._change_record(route53, "UPSERT", props["zone_id"], record)
+
+            acm.get_waiter("certificate_validated").wait(
+                CertificateArn=arn,
+                WaiterConfig={
+                    "Delay": _WAITER_DELAY_SECONDS,
+                    "MaxAttempts": _WAITER_MAX_ATTEMPTS,
+                },
+            )
+        except Exception:
+            self._delete(acm, route53, arn, props["zone_id"], record)
+            raise
+
+        return pulumi.dynamic.CreateResult(
+            id_=arn,
+            outs={
+                **props,
+                "certificate_arn": arn,
+                "validation_record": record,
+            },
+        )
+
+    def diff(
+        self,
+        _id: str,
+        olds: dict[str, Any],
+        news: dict[str, Any],
+    ) -> pulumi.dynamic.DiffResult:
+        # Certificates can't be modified; any change means a new certificate.
+        replaces = [key for key in _INPUTS if olds.get(key) != news.get(key)]
+        return pulumi.dynamic.DiffResult(
+            changes=bool(replaces),
+            replaces=replaces,
+            delete_before_replace=False,
+        )
+
+    def delete(self, _id: str, props: dict[str, Any]) -> None:
+        self._delete(
+            _client(props, "acm", region=props["region"]),
+            _client(props, "route53"),
+            _id,
+            props["zone_id"],
+            props["validation_record"],
+        )
+
+    @classmethod
+    def _delete(
+        cls,
+        acm: Any,
+        route53: Any,
+        arn: str,
+        zone_id: str,
+        record: Optional[dict[str, str]],
+    ) -> None:
+        if record is not None:
+            try:
+                cls._change_record(route53, "DELETE", zone_id, record)
+            except route53.exceptions.InvalidChangeBatch:
+                pass  # already gone
+
+        acm.delete_certificate(CertificateArn=arn)
+
+    @staticmethod
+    def _validation_record(acm: Any, arn: str) -> dict[str, str]:
+        for _ in range(_RECORD_POLL_MAX_ATTEMPTS):
+            certificate = acm.describe_certificate(CertificateArn=arn)["Certificate"]
+            options = certificate.get("DomainValidationOptions", [])
+            if options and "ResourceRecord" in options[0]:
+                return options[0]["ResourceRecord"]
+            time.sleep(_RECORD_POLL_DELAY_SECONDS)
+        raise ValidationRecordNotFound(arn)
+
+    @staticmethod
+    def _change_record(
+        route53: Any,
+        action: str,
+        zone_id: str,
+        record: dict[str, str],
+    ) -> None:
+        route53.change_resource_record_sets(
+            HostedZoneId=zone_id,
+            ChangeBatch={
+                "Changes": [
+                    {
+                        "Action": action,
+                        "ResourceRecordSet": {
+                            "Name": record["Name"],
+                            "Type": record["Type"],
+                            "TTL": _RECORD_TTL_SECONDS,
+                            "ResourceRecords": [{"Value": record["Value"]}],
+                        },
+                    }
+                ]
+            },
+        )
+
+
+class DnsValidatedCertificate(pulumi.dynamic.Resource):
+    """
+    An ACM certificate validated through DNS, as a single resource.
+
+    Replaces the `aws.acm.Certificate` → `aws.route53.Record` →
+    `aws.acm.CertificateValidation` chain (three resources that can only be
+    created one after the other), and waits for validation with tunable polling
+    instead of the provider's built-in retry heuristics (which tend to time
+    out).
+    """
+
+    certificate_arn: pulumi.Output[str]
+
+    def __init__(
+        self,
+        resource_name: str,
+        domain_name: pulumi.Input[str],
+        zone_id: pulumi.Input[str],
+        region: str,
+        profile: Optional[str] = None,
+        max_retries: Optional[int] = None,
+        retry_mode: Optional[str] = None,
+        opts: Optional[pulumi.ResourceOptions] = None,
+    ) -> None:
+        """
+        `profile`, `max_retries` and `retry_mode` configure the AWS clients
+        the same way as the stack's `aws` provider (see the `aws:*` config).
+        """
+        super().__init__(
+            _DnsValidatedCertificateProvider(),
+            resource_name,
+            {
+                "domain_name": domain_name,
+                "zone_id": zone_id,
+                "region": region,
+                "profile": profile,
+                "max_retries": max_retries,
+                "retry_mode": retry_mode,
+                # Outputs, populated on create.
+                "certificate_arn": None,
+                "validation_record": None,
+            },
+            opts,
+        )
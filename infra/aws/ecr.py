@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import functools
 from dataclasses import dataclass
 
 import pulumi
@@ -14,6 +15,22 @@ class ECRImage:
     image: docker.Image
 
 
+@functools.lru_cache(maxsize=None)
+def registry_credentials() -> docker.RegistryArgs:
+    """
+    Credentials to push images to the account's ECR registry.
+
+    Every repository in the account lives in the same registry, so a single
+    authorization token is requested per program run and shared by all images.
+    """
+    auth_token = pulumi_aws.ecr.get_authorization_token_output()
+    return docker.RegistryArgs(
+        username=auth_token.user_name,
+        password=auth_token.password,
+        server=auth_token.proxy_endpoint,
+    )
+
+
 def declare_image_in_ecr(
     name: str,
     aws_provider: pulumi_aws.Provider,
@@ -40,13 +57,45 @@ def declare_image_in_ecr(
         ),
     )
 
-    auth_token = pulumi_aws.ecr.get_authorization_token_output(
-        registry_id=repo.registry_id,
+    image = declare_image_in_repo(
+        name=name,
+        repo=repo,
+        dockerfile=dockerfile,
+    )
+
+    return ECRImage(
+        repo=repo,
+        image=image,
     )
 
-    image_name = repo.repository_url.apply(lambda url: f"{url}:latest")
 
-    # Declare the docker image build process for this app.
+def declare_image_in_repo(
+    name: str,
+    repo: pulumi_aws.ecr.Repository,
+    dockerfile: str,
+    tag: str = "latest",
+) -> docker.Image:
+    """
+    Declare a Docker image build, pushed to an existing ECR repository.
+
+    Useful to host auxiliary images (e.g. migrations) next to the app image
+    they go with, under a different tag, instead of creating a repo for each.
+
+    Args:
+        name (str): Name for the image.
+        repo (pulumi_aws.ecr.Repository): The repository to push the image to.
+        dockerfile (str): Path to the Dockerfile to build.
+        tag (str, optional): Tag to push the image as. Defaults to "latest".
+    """
+    res_name = to_resource_name(name)
+
+    image_name = repo.repository_url.apply(lambda url: f"{url}:{tag}")
+
+    # Images don't depend on each other, so the engine already builds (and
+    # pushes) them concurrently; what's left to save is rebuilding unchanged
+    # layers. The previously pushed image carries its build cache inline
+    # (BUILDKIT_INLINE_CACHE) and is used as the cache source for the next
+    # build, so each image's repo doubles as its registry cache.
     image = docker.Image(
         f"{res_name}-image",
         build=docker.DockerBuildArgs(
@@ -57,11 +106,7 @@ def declare_image_in_ecr(
             platform="linux/amd64",
         ),
         image_name=image_name,
-        registry=docker.RegistryArgs(
-            username=auth_token.user_name,
-            password=auth_token.password,
-            server=auth_token.proxy_endpoint,
-        ),
+        registry=registry_credentials(),
         opts=pulumi.ResourceOptions(
             # Built locally; needs no provider.
             parent=repo,  # image makes no sense without repo
@@ -69,7 +114,4 @@ def declare_image_in_ecr(
         ),
     )
 
-    return ECRImage(
-        repo=repo,
-        image=image,
-    )
+    return image
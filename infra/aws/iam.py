@@ -9,6 +9,9 @@ import pulumi_kubernetes as k8s
 
 from ..common import to_resource_name
 
+# IAM doesn't care about whitespace; the compact form is shorter to store/diff.
+_JSON_SEPARATORS = (",", ":")
+
 
 def declare_service_account(
     name: str,
@@ -38,7 +41,8 @@ def declare_service_account(
                     cluster_oidc_arn=args[0],
                     cluster_oidc_url=args[1],
                     service_account_name=f"system:serviceaccount:{args[2]}:{serviceaccount_name}",
-                )
+                ),
+                separators=_JSON_SEPARATORS,
             ),
         ),
         opts=pulumi.ResourceOptions(
@@ -128,24 +132,37 @@ EmptyPolicyDocument = {
 
 
 def policy_json_from_statements(
-    *statements: Optional[pulumi.Output[PolicyStatement]],
+    *statements: Optional[pulumi.Output[PolicyStatement] | PolicyStatement],
 ) -> pulumi.Output[str]:
     """
     Create a `pulumi.Output` that'll materialize into a JSON serialized IAM
     Policy document that includes all of the supplied statements.
 
+    Statements can be given as plain `PolicyStatement` dicts when they are
+    known up front; when none of them is a `pulumi.Output`, the document is
+    serialized right away.
+
     If no `PolicyStatement` are supplied, output will materialize into the JSON
     serialization of `EmptyPolicyDocument`.
     """
     filtered_sts = [s for s in statements if s is not None]
     if not filtered_sts:
-        return pulumi.Output.from_input(json.dumps(EmptyPolicyDocument))
-
-    return pulumi.Output.all(*filtered_sts).apply(
-        lambda sts: json.dumps(
-            {
-                "Version": "2012-10-17",
-                "Statement": sts,
-            }
+        return pulumi.Output.from_input(
+            json.dumps(EmptyPolicyDocument, separators=_JSON_SEPARATORS)
         )
+
+    # Statements that are already known don't need to go through Output.all.
+    if not any(isinstance(s, pulumi.Output) for s in filtered_sts):
+        return pulumi.Output.from_input(_policy_json(filtered_sts))
+
+    return pulumi.Output.all(*filtered_sts).apply(_policy_json)
+
+
+def _policy_json(statements: list[PolicyStatement]) -> str:
+    return json.dumps(
+        {
+            "Version": "2012-10-17",
+            "Statement": statements,
+        },
+        separators=_JSON_SEPARATORS,
     )
@@ -73,9 +73,5 @@ def declare_alb_controller(
         opts=pulumi.ResourceOptions(
             parent=namespace,
             provider=k8s_provider,
-            # Ignore changes to checksum; bug in pulumi-kubernetes; see:
-            # https://github.com/pulumi/pulumi-kubernetes/issues/2649
-            # Remove this once that issue is resolved.
-            ignore_changes=["checksum"],
         ),
     )
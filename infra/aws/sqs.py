@@ -67,6 +67,7 @@ def declare_queue_with_dlq(
                     "deadLetterTargetArn": dlq_arn,
                     "maxReceiveCount": max_delivery_attempts,
                 },
+                separators=(",", ":"),
             ),
         ),
         opts=pulumi.ResourceOptions(
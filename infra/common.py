@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import functools
 from base64 import b64encode
 from typing import Optional
 
@@ -22,19 +23,23 @@ def image_sha(
 
     The length of the digest can be specified; defaults to 7 characters.
     """
-    return image.apply(lambda i: i.split("sha256:")[1][0:length])
+    return image.apply(lambda i: i.partition("sha256:")[2][:length])
 
 
+@functools.lru_cache(maxsize=None)
 def to_k8s_secret(cfg: pulumi.Config, key: str) -> pulumi.Output[str]:
     """
     Read the given key from the pulumi configuration object and return it as a
     base64-encoded string to populate a value for a Kubernetes Secret.
+
+    Memoized per (config, key): the same secret is often used by several
+    zones, and the resulting output can safely be shared between them.
     """
     value = cfg.require_secret(key)
-    return value.apply(lambda s: base64_str(s))
+    return value.apply(base64_str)
 
 
+@functools.lru_cache(maxsize=1024)
 def base64_str(input: str) -> str:
-    string_bytes = input.encode("utf-8")
-    base64_bytes = b64encode(string_bytes)
-    return base64_bytes.decode("utf-8")
+    # base64 output is ASCII by construction; no need for UTF-8 decoding.
+    return b64encode(input.encode("utf-8")).decode("ascii")
@@ -1,10 +1,17 @@
 # -*- coding: utf-8 -*-
+from pathlib import Path
 from typing import Dict, Optional
 
 import pulumi
 import pulumi_eks
 import pulumi_kubernetes as k8s
 
+# Read once, as a string asset: the engine hashes it in memory rather than
+# re-reading the file from disk on every preview/update.
+_VALUES_YAML = pulumi.StringAsset(
+    (Path(__file__).parent / "values.yaml").read_text(encoding="utf-8")
+)
+
 
 def declare_datadog_cluster_agent(
     api_key: pulumi.Output[str],
@@ -40,25 +47,34 @@ def declare_datadog_cluster_agent(
             repo="https://helm.datadoghq.com",
         ),
         namespace=namespace.metadata.name,
-        value_yaml_files=[pulumi.FileAsset("./infra/datadog/values.yaml")],
+        value_yaml_files=[_VALUES_YAML],
         # Overrides (or extra key-values) applied to values.yaml
         values={
             "datadog": {
                 "apiKey": api_key,
             },
         },
+        # Ordered after the namespace (and so the cluster) by its name.
         opts=pulumi.ResourceOptions(
             provider=k8s_provider,
             parent=namespace,
-            depends_on=[cluster],
-            # Ignore changes to checksum; bug in pulumi-kubernetes; see:
-            # https://github.com/pulumi/pulumi-kubernetes/issues/2649
-            # Remove this once that issue is resolved.
-            ignore_changes=["checksum"],
         ),
     )
 
 
+# Mark the pod as a target for the DataDog Admission Controller mutation
+# webhook (see infra/datadog/values.yaml#clusterAgent.admissionController)
+_ADMISSION_LABELS: Dict[str, str] = {
+    "admission.datadoghq.com/enabled": "true",
+}
+
+# Instrumentation (traces) for Python services.
+# Releases: https://gallery.ecr.aws/datadog/dd-lib-python-init
+_APM_ANNOTATIONS: Dict[str, str] = {
+    "admission.datadoghq.com/python-lib.version": "v1.20.5",
+}
+
+
 def datadog_labels(
     env: pulumi.Output[str] | str,
     service: pulumi.Output[str] | str,
@@ -66,20 +82,12 @@ def datadog_labels(
     return {
         "tags.datadoghq.com/env": env,
         "tags.datadoghq.com/service": service,
-        # Mark the pod as a target for the DataDog Admission Controller mutation
-        # webhook (see infra/datadog/values.yaml#clusterAgent.admissionController)
-        "admission.datadoghq.com/enabled": "true",
+        **_ADMISSION_LABELS,
     }
 
 
 def datadog_annotations(
     enable_apm: bool = False,
 ) -> Dict[str, str]:
-    annotations: Dict[str, str] = {}
-
-    if enable_apm:
-        # Instrumentation (traces) for Python services.
-        # Releases: https://gallery.ecr.aws/datadog/dd-lib-python-init
-        annotations["admission.datadoghq.com/python-lib.version"] = "v1.20.5"
-
-    return annotations
+    # Always a fresh dict: callers may extend it with their own annotations.
+    return {**_APM_ANNOTATIONS} if enable_apm else {}
@@ -25,7 +25,8 @@ def declare_http_server(
     replicas: int = 1,
     env_overrides: dict[str, str] = {},
     exposed_as: Optional[PublicHttpServer] = None,
-    is_allowed_to: list[pulumi.Output[iam.PolicyStatement]] = [],
+    is_allowed_to: list[pulumi.Output[iam.PolicyStatement] | iam.PolicyStatement] = [],
+    init_images: dict[str, docker.Image] = {},
 ) -> None:
     if exposed_as is not None and len(exposed_as.subdomains) == 0:
         raise ValueError(
@@ -44,6 +45,7 @@ def declare_http_server(
             **env_overrides,
         },
         is_allowed_to=is_allowed_to,
+        init_images=init_images,
     )
 
     service = k8s.core.v1.Service(
@@ -72,28 +74,55 @@ def declare_http_server(
     )
 
     if exposed_as is not None:
+        # Shared by all ingresses: an ingress makes no sense without the
+        # service, and referencing the service's name already orders them after
+        # it (no need for an explicit depends_on).
+        ingress_opts = pulumi.ResourceOptions(
+            provider=zone.k8s_provider,
+            parent=service,
+        )
+        # Likewise, none of the ALB annotations vary by subdomain.
+        ingress_annotations = _alb_annotations(
+            env=env,
+            certificate_arn=exposed_as.certificate_arn,
+        )
         for subdomain in exposed_as.subdomains:
             _expose_service(
                 service=service,
-                env=env,
                 host=f"{subdomain}.{exposed_as.domain}",
-                certificate_arn=exposed_as.certificate_arn,
-                k8s_provider=zone.k8s_provider,
+                annotations=ingress_annotations,
+                opts=ingress_opts,
             )
 
 
+def _alb_annotations(
+    env: pulumi.Output[str] | str,
+    certificate_arn: pulumi.Output[str] | str,
+) -> dict[str, pulumi.Output[str] | str]:
+    # reference for ALB specific annotations:
+    # https://kubernetes-sigs.github.io/aws-load-balancer-controller/v2.6/guide/ingress/annotations/
+    return {
+        "kubernetes.io/ingress.class": "alb",
+        "alb.ingress.kubernetes.io/scheme": "internet-facing",
+        "alb.ingress.kubernetes.io/listen-ports": '[{"HTTP": 80}, {"HTTPS":443}]',
+        "alb.ingress.kubernetes.io/ssl-redirect": "443",
+        "alb.ingress.kubernetes.io/certificate-arn": certificate_arn,
+        "alb.ingress.kubernetes.io/tags": f"Environment={env}",
+    }
+
+
 def _expose_service(
     service: k8s.core.v1.Service,
     host: str,
-    env: pulumi.Output[str] | str,
-    certificate_arn: pulumi.Output[str] | str,
-    k8s_provider: k8s.Provider,
+    annotations: dict[str, pulumi.Output[str] | str],
+    opts: pulumi.ResourceOptions,
     path: str = "/",
 ) -> None:
     """
     Expose an HTTP server to internet traffic on the given host.
 
-    Declares an Ingress with annotations for AWS Application Load Balancer.
+    Declares an Ingress with the given annotations for AWS Application Load
+    Balancer (see `_alb_annotations`).
     When ALB Controller is installed in the cluster, an AWS EC2 Load Balancer
     with linked Target Group will be created.
 
@@ -108,16 +137,7 @@ def _expose_service(
         f"{host}-ingress",
         metadata=k8s.meta.v1.ObjectMetaArgs(
             name=host,  # display name (for k8s dashboard/cli tools)
-            annotations={
-                # reference for ALB specific annotations:
-                # https://kubernetes-sigs.github.io/aws-load-balancer-controller/v2.6/guide/ingress/annotations/
-                "kubernetes.io/ingress.class": "alb",
-                "alb.ingress.kubernetes.io/scheme": "internet-facing",
-                "alb.ingress.kubernetes.io/listen-ports": '[{"HTTP": 80}, {"HTTPS":443}]',
-                "alb.ingress.kubernetes.io/ssl-redirect": "443",
-                "alb.ingress.kubernetes.io/certificate-arn": certificate_arn,
-                "alb.ingress.kubernetes.io/tags": f"Environment={env}",
-            },
+            annotations=annotations,
         ),
         spec=k8s.networking.v1.IngressSpecArgs(
             rules=[
@@ -142,9 +162,5 @@ def _expose_service(
                 )
             ],
         ),
-        opts=pulumi.ResourceOptions(
-            provider=k8s_provider,
-            parent=service,  # ingress makes no sense without service
-            depends_on=[service],
-        ),
+        opts=opts,
     )
@@ -13,7 +13,7 @@ def declare_worker(
     dockerfile_or_image: str | docker.Image,
     replicas: int = 1,
     env_overrides: dict[str, str] = {},
-    is_allowed_to: list[pulumi.Output[iam.PolicyStatement]] = [],
+    is_allowed_to: list[pulumi.Output[iam.PolicyStatement] | iam.PolicyStatement] = [],
 ) -> None:
     declare_app(
         app_name=worker_name,
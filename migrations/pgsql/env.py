@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
+import hashlib
 import os
 from logging.config import fileConfig
 
 from alembic import context
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import engine_from_config, func, pool, sql
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -42,6 +43,16 @@ db_url = f"postgresql://{POSTGRESQL_USER}:{POSTGRESQL_PASSWORD}@{POSTGRESQL_HOST
 
 config.set_main_option("sqlalchemy.url", db_url)
 
+# Key of the advisory lock that serializes concurrent migration runs (e.g. the
+# init containers of several API replicas starting at once). Derived the same
+# way as in recollect.db.advisory_lock: pg advisory lock keys are limited to an
+# 8-byte signed integer.
+MIGRATIONS_LOCK_KEY = int.from_bytes(
+    hashlib.sha256(b"alembic-migrations").digest()[:8],
+    byteorder="big",
+    signed=True,
+)
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -81,6 +92,14 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
+        # Wait for any other run to finish before migrating; it then finds the
+        # schema already at head. A session-level lock (rather than one tied to
+        # the migration transaction) stays held across migrations that commit
+        # on their own, e.g. CREATE INDEX CONCURRENTLY in an autocommit block.
+        # It's released when the connection is closed.
+        connection.execute(sql.select(func.pg_advisory_lock(MIGRATIONS_LOCK_KEY)))
+        connection.commit()
+
         context.configure(connection=connection, target_metadata=target_metadata)
 
         with context.begin_transaction():
@@ -1,11 +1,10 @@
 # -*- coding: utf-8 -*-
 import asyncio
-import json
 import os
-import re
 from typing import Any
 
 import aiohttp
+import orjson
 import requests
 from fastapi import FastAPI
 from pydantic import BaseModel
@@ -13,12 +12,6 @@ from pydantic import BaseModel
 from ray import serve
 
 
-async def process(url: str, headers: dict, data: dict = None):
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, headers=headers, json=data) as response:
-            return await response.read()
-
-
 class PostPayload(BaseModel):
     text: str
     model: str
@@ -32,17 +25,26 @@ class PostResponse(BaseModel):
 
 fastapi_app = FastAPI()
 
+_DEFAULT_SYSTEM_PROMPT = "You are a helpful assistant."
+_DEFAULT_PROMPT = "Summarize the following: \n{text} Summary:"
+
 
 @serve.deployment()
 @serve.ingress(fastapi_app)
 class Summarizer:
     def __init__(self):
+        # Created on first use, as it must be from within the event loop.
+        self._session: aiohttp.ClientSession | None = None
         self._temperature = 0.0
         self._max_parallel_requests = 5
+        # Caps in-flight requests to the LLM endpoint across concurrent
+        # batches, independently of the batch size.
+        self._requests_sem = asyncio.Semaphore(self._max_parallel_requests)
         match os.getenv("LLM_PROVIDER"):
             case "anyscale":
                 self._url = os.getenv("ANYSCALE_ENDPOINTS_CLOUD_URL")
                 self._headers = {
+                    "Content-Type": "application/json",
                     "Authorization": f"Bearer {os.getenv('ANYSCALE_ENDPOINTS_API_KEY')}",
                 }
             case "fireworks":
@@ -54,9 +56,31 @@ class Summarizer:
             case _:
                 self._url = os.getenv("ANYSCALE_ENDPOINTS_CLOUD_URL")
                 self._headers = {
+                    "Content-Type": "application/json",
                     "Authorization": f"Bearer {os.getenv('ANYSCALE_ENDPOINTS_API_KEY')}",
                 }
 
+    async def __del__(self):
+        # Called by serve on replica shutdown.
+        if self._session is not None:
+            await self._session.close()
+
+    async def _post(self, body: bytes) -> tuple[int, bytes]:
+        # One session (and connection pool) for the lifetime of the replica, so
+        # requests reuse open keep-alive connections to the LLM endpoint rather
+        # than each paying for a new connection and TLS handshake.
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75,
+                ),
+            )
+        async with self._requests_sem, self._session.post(
+            self._url, headers=self._headers, data=body
+        ) as response:
+            return response.status, await response.read()
+
     @fastapi_app.post("/", response_model=PostResponse)
     async def summarize(self, payload: PostPayload):
         """Summarize text using LLM endpoint service
@@ -66,41 +90,59 @@ class Summarizer:
         # Fireworks.ai Endpoints
         Supported models: https://fireworks.ai/models
         """
-        payload = json.loads((payload.model_dump_json()))
+        payload = payload.model_dump()
         return await self.handle_batch(payload)
 
     # TODO anyscale match concurrent requests is 5
     @serve.batch(max_batch_size=5, batch_wait_timeout_s=0.1)
     async def handle_batch(self, payloads: list[dict[str, Any]]) -> list[str]:
+        temperature = self._temperature
         batch = []
         for payload in payloads:
-            system_prompt = payload["system_prompt"] or "You are a helpful assistant."
-            prompt = payload["prompt"] or "Summarize the following: \n{text} Summary:"
-            text = re.sub(r"\s+", " ", payload["text"])
-            user_prompt = prompt.format(text=text)
-            data = {
-                "model": payload["model"],
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                "temperature": self._temperature,
-            }
-            batch.append(data)
-
-        tasks = [process(self._url, self._headers, elem) for elem in batch]
-        responses = await asyncio.gather(*tasks)
+            system_prompt = payload["system_prompt"] or _DEFAULT_SYSTEM_PROMPT
+            prompt = payload["prompt"] or _DEFAULT_PROMPT
+            # Collapse whitespace runs (C fast path; no regex engine involved).
+            text = " ".join(payload["text"].split())
+            batch.append(
+                {
+                    "model": payload["model"],
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": prompt.replace("{text}", text)},
+                    ],
+                    "temperature": temperature,
+                }
+            )
+
+        # Identical requests in the same batch (e.g. retried or duplicated
+        # calls) are only sent upstream once; each gets the shared result.
+        bodies: dict[bytes, int] = {}
+        indices = [
+            bodies.setdefault(orjson.dumps(data), len(bodies)) for data in batch
+        ]
+
+        tasks = [self._post(body) for body in bodies]
+        # A failed request only fails its own element of the batch.
+        responses = await asyncio.gather(*tasks, return_exceptions=True)
 
         results = []
         for response in responses:
             try:
-                response = json.loads(response.decode())
+                if isinstance(response, BaseException):
+                    raise response
+                status, body = response
+                if status != 200:
+                    # Error bodies (HTML or provider-specific JSON) have no
+                    # summary in them; don't bother parsing.
+                    results.append({"summary": f"upstream HTTP {status}"})
+                    continue
+                response = orjson.loads(body)
                 summary = response["choices"][0]["message"]["content"]
                 results.append({"summary": summary.strip()})
             except Exception as e:
                 results.append({"summary": str(e)})
 
-        return results
+        return [results[i] for i in indices]
 
 
 app = Summarizer.options().bind()
@@ -1,28 +1,44 @@
 # -*- coding: utf-8 -*-
+import functools
 import os
 
 import boto3
+from botocore.config import Config
 from mypy_boto3_cognito_idp import CognitoIdentityProviderClient
 from mypy_boto3_s3 import S3Client  # type: ignore
 from mypy_boto3_sqs import SQSClient
 
+# Clients are created once per process and shared (boto3 clients are
+# thread-safe), so give them enough connections to be used concurrently.
+_CLIENT_CONFIG = Config(
+    max_pool_connections=32,
+    retries={"mode": "standard", "max_attempts": 3},
+    tcp_keepalive=True,
+)
 
+
+@functools.lru_cache(maxsize=None)
 def sqs_client_from_env() -> SQSClient:
     return boto3.client(
         "sqs",
         endpoint_url=os.getenv("SQS_ENDPOINT_URL"),
+        config=_CLIENT_CONFIG,
     )
 
 
+@functools.lru_cache(maxsize=None)
 def s3_client_from_env() -> S3Client:
     return boto3.client(
         "s3",
         endpoint_url=os.getenv("S3_ENDPOINT_URL"),
+        config=_CLIENT_CONFIG,
     )
 
 
+@functools.lru_cache(maxsize=None)
 def cognito_client_from_env() -> CognitoIdentityProviderClient:
     return boto3.client(
         "cognito-idp",
         endpoint_url=os.getenv("COGNITO_ENDPOINT_URL"),
+        config=_CLIENT_CONFIG,
     )
@@ -104,3 +104,16 @@ class ParagraphV2Collection(
         hybrid_search_factor: float = 1.0,
     ) -> list[SentenceMatch]:
         raise NotImplementedError()
+
+    @abstractmethod
+    def find_similar_sentences_many(
+        self,
+        queries: list[tuple[str, Filter, int]],
+        hybrid_search_factor: float = 1.0,
+    ) -> list[list[SentenceMatch]]:
+        """
+        Batch version of `find_similar_sentences`, for multiple
+        (search_text, filter, limit_results) queries. Returns the matches for
+        each query, in the same order as the queries.
+        """
+        raise NotImplementedError()
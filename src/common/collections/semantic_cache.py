@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Generic, Hashable, Optional, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Entries(Generic[T]):
+    # Unit-normalized query vectors, one row per cached query.
+    vectors: np.ndarray
+    values: list[T] = field(default_factory=list)
+    created_at: list[float] = field(default_factory=list)
+    last_hit_at: list[float] = field(default_factory=list)
+
+
+class SemanticQueryCache(Generic[T]):
+    """
+    In-process cache of query results, looked up by similarity of the query's
+    embedding rather than by its exact text, so that near-duplicate queries
+    (e.g. the same question, rephrased) reuse the results of earlier ones.
+
+    Results are partitioned by a key that must capture everything else the
+    results depend on (e.g. user, filters, limit); lookups only consider
+    queries cached under the same key.
+
+    Entries expire after `ttl_seconds`, so newly added objects show up in
+    results within that time. When a key is full, the entry that was least
+    recently hit (or inserted) is evicted; when there are too many keys, the
+    least recently used key is evicted.
+
+    Safe for concurrent use from multiple threads.
+    """
+
+    def __init__(
+        self,
+        min_similarity: float = 0.95,
+        ttl_seconds: float = 300.0,
+        max_keys: int = 1024,
+        max_entries_per_key: int = 32,
+    ) -> None:
+        self._min_similarity = min_similarity
+        self._ttl = ttl_seconds
+        self._max_keys = max_keys
+        self._max_entries_per_key = max_entries_per_key
+        self._entries: OrderedDict[Hashable, _Entries[T]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, query_vector: list[float]) -> Optional[T]:
+        """
+        Return the value cached for the most similar query under `key`, if its
+        cosine similarity to `query_vector` is at least `min_similarity`.
+        """
+        vector = _normalized(query_vector)
+        now = time.monotonic()
+
+        with self._lock:
+            entries = self._entries.get(key)
+            if entries is None:
+                return None
+            self._expire(entries, now)
+            if len(entries.values) == 0:
+                return None
+
+            self._entries.move_to_end(key)
+            scores = entries.vectors @ vector
+            best = int(np.argmax(scores))
+            if scores[best] < self._min_similarity:
+                return None
+
+            entries.last_hit_at[best] = now
+            return entries.values[best]
+
+    def put(self, key: Hashable, query_vector: list[float], value: T) -> None:
+        """Cache `value` as the result of `query_vector` under `key`."""
+        vector = _normalized(query_vector)
+        now = time.monotonic()
+
+        with self._lock:
+            entries = self._entries.get(key)
+            if entries is None:
+                entries = _Entries(vectors=np.empty((0, len(vector)), np.float32))
+                self._entries[key] = entries
+                if len(self._entries) > self._max_keys:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+                self._expire(entries, now)
+
+            if len(entries.values) >= self._max_entries_per_key:
+                self._remove(entries, [int(np.argmin(entries.last_hit_at))])
+
+            entries.vectors = np.vstack([entries.vectors, vector])
+            entries.values.append(value)
+            entries.created_at.append(now)
+            entries.last_hit_at.append(now)
+
+    def _expire(self, entries: _Entries[T], now: float) -> None:
+        expired = [
+            i
+            for i, created_at in enumerate(entries.created_at)
+            if now - created_at > self._ttl
+        ]
+        if expired:
+            self._remove(entries, expired)
+
+    @staticmethod
+    def _remove(entries: _Entries[T], indices: list[int]) -> None:
+        entries.vectors = np.delete(entries.vectors, indices, axis=0)
+        for i in sorted(indices, reverse=True):
+            del entries.values[i]
+            del entries.created_at[i]
+            del entries.last_hit_at[i]
+
+
+def _normalized(vector: list[float]) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm > 0 else array
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from abc import ABC, abstractmethod
-from typing import Generic, Optional
+from typing import Generic, Iterator, Optional
 from uuid import UUID
 
 from .collections import Collection, CollectionObjectType
@@ -48,6 +48,17 @@ class UserCollection(
     ) -> Optional[CollectionObjectType]:
         raise NotImplementedError()
 
+    @abstractmethod
+    def get_many_by_ids(
+        self,
+        ids: list[UUID],
+    ) -> dict[UUID, CollectionObjectType]:
+        """
+        Read multiple objects by ID with a single query. IDs that don't exist
+        are absent from the result.
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     def get_by_user_id(
         self,
@@ -57,6 +68,19 @@ class UserCollection(
     ) -> list[CollectionObjectType]:
         raise NotImplementedError()
 
+    @abstractmethod
+    def iter_by_user_id(
+        self,
+        user_id: UUID,
+        page_size: int = 100,
+        max_in_flight: int = 4,
+    ) -> Iterator[CollectionObjectType]:
+        """
+        Iterate over all of a user's objects, fetching them page by page with
+        up to `max_in_flight` pages requested concurrently.
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     def count(self) -> int:
         raise NotImplementedError()
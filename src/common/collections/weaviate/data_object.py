@@ -38,6 +38,10 @@ class WeaviateObjectMapper(
 
     def __init__(self, record_cls: type[CollectionObjectType]) -> None:
         self._record_cls = record_cls
+        # _additional keys are computed by weaviate and only relevant for reads;
+        # they're left out when serializing objects to submit.
+        self._additional_fields = tuple(self.additional_fields())
+        self._write_exclude = frozenset(self._additional_fields)
 
     def fields(self) -> list[str]:
         """
@@ -86,11 +90,9 @@ class WeaviateObjectMapper(
         server-side and thus have no meaning on insert/update).
         """
 
-        data = record.model_dump(mode="json")
-        # _additional keys are computed by weaviate and only relevant for reads;
-        # pop them from the dictionary to submit.
-        for add in self.additional_fields():
-            data.pop(add)
+        # Excluded at serialization time, so e.g. the vector isn't converted to
+        # JSON only to be thrown away.
+        data = record.model_dump(mode="json", exclude=self._write_exclude)
 
         return WeaviateDataObject(
             id=record.id,
@@ -102,9 +104,9 @@ class WeaviateObjectMapper(
         """Convert a Weaviate data object to a `CollectionObject` subclass."""
 
         # Weaviate returns values under both `data` and `_additional` keys.
-        # Merge them into a single dictionary to pass to `model_validate`.
-        additional = data.pop("_additional")
-        for add in self.additional_fields():
-            data[add] = additional.pop(add)
-
-        return self._record_cls.model_validate(data)
+        # Merge them into a single dictionary to pass to `model_validate`
+        # (without mutating the caller's data; extra keys are ignored).
+        additional = data["_additional"]
+        return self._record_cls.model_validate(
+            {**data, **{add: additional[add] for add in self._additional_fields}}
+        )
@@ -1,17 +1,25 @@
 # -*- coding: utf-8 -*-
-from typing import Any
+from typing import Any, Optional
 from uuid import UUID
 
 import weaviate  # type: ignore (no stubs)
 
-from ...text import CrossEncodeFunc, CrossEncodeInput, EmbedFunc
+from ...text import (
+    CrossEncodeBatchFunc,
+    CrossEncodeFunc,
+    CrossEncodeInput,
+    EmbedFunc,
+    cross_encode_one_by_one,
+)
 from ..collections import Collections
 from ..paragraph import ParagraphV1, ParagraphV1Collection, SentenceMatch
+from ..semantic_cache import SemanticQueryCache
 from ..user_collection import Collection
 from .user_collection import (
     WeaviateObjectMapper,
     WeaviateUserCollection,
     get_data_objects,
+    split_sentences,
     user_id_eq,
 )
 
@@ -46,10 +54,16 @@ class WeaviateParagraphV1Collection(
         embed_func: EmbedFunc,
         cross_encode_func: CrossEncodeFunc,
         collection: Collection = Collections.Paragraph_v20230517,
+        cross_encode_batch_func: Optional[CrossEncodeBatchFunc] = None,
+        query_cache: Optional[SemanticQueryCache[list[dict[str, Any]]]] = None,
     ) -> None:
         super().__init__(client, collection, WeaviateParagraphV1Mapper())
         self._embed = embed_func
-        self._xenc = cross_encode_func
+        self._xenc_batch = cross_encode_batch_func or cross_encode_one_by_one(
+            cross_encode_func
+        )
+        # Optional: reuse the paragraphs found for near-identical queries.
+        self._query_cache = query_cache
 
     def find_similar_sentences(
         self,
@@ -59,53 +73,86 @@ class WeaviateParagraphV1Collection(
         min_score: float = 0.7,
     ) -> list[SentenceMatch]:
         # Embed the search text
-        class_name = self.collection_class.name
+        class_name = self._collection_name
         query_vector = self._embed(search_text)
 
-        # Query the vector database for similar paragraphs
-        result: dict[str, Any] = (
-            self._client.query.get(class_name, self._mapper.fields())
-            .with_where(user_id_eq(user_id))
-            .with_near_vector({"vector": query_vector, "certainty": min_score})
-            .with_additional(self._mapper.additional_fields())
-            .with_limit(limit_results)
-            .do()
-        )
-        matches = get_data_objects(
-            result,
-            class_name,
-            description=lambda: f"find similar sentences for user_id={user_id}",
+        cache_key = (user_id, limit_results, min_score)
+        matches = (
+            self._query_cache.get(cache_key, query_vector)
+            if self._query_cache is not None
+            else None
         )
 
+        if matches is None:
+            # Query the vector database for similar paragraphs
+            result: dict[str, Any] = (
+                self._client.query.get(class_name, self._fields)
+                .with_where(user_id_eq(user_id))
+                .with_near_vector({"vector": query_vector, "certainty": min_score})
+                .with_additional(self._search_additional_fields)
+                .with_limit(limit_results)
+                .do()
+            )
+            matches = split_sentences(
+                get_data_objects(
+                    result,
+                    class_name,
+                    description=lambda: f"find similar sentences for user_id={user_id}",
+                )
+            )
+            if self._query_cache is not None:
+                self._query_cache.put(cache_key, query_vector, matches)
+
         # Pick the best matching sentence from each paragraph.
-        best_matches = [self._best_match(search_text, m) for m in matches]
+        best_matches = self._best_matches(search_text, matches)
 
         return best_matches
 
-    def _best_match(
+    def _best_matches(
         self,
         text: str,
-        match: dict[str, Any],
-    ) -> SentenceMatch:
-        # No need to cross-encode if there's only one match.
-        if len(match["sentence_numbers"]) == 1:
-            return SentenceMatch(
-                document_id=match["doc_id"],
-                sentence_number=match["sentence_numbers"][0],
-                sentence=match["text"],
-                paragraph_search_score=match["_additional"]["certainty"],
-                cross_encoding_score=0.0,
+        matches: list[dict[str, Any]],
+    ) -> list[SentenceMatch]:
+        """
+        Pick the best matching sentence from each paragraph, cross-encoding all
+        paragraphs that need it in a single batch.
+        """
+        best_matches: list[Optional[SentenceMatch]] = []
+        xenc_indices: list[int] = []
+        xenc_inputs: list[CrossEncodeInput] = []
+
+        for match in matches:
+            # No need to cross-encode if there's only one match.
+            if len(match["sentence_numbers"]) == 1:
+                best_matches.append(
+                    SentenceMatch(
+                        document_id=match["doc_id"],
+                        sentence_number=match["sentence_numbers"][0],
+                        sentence=match["text"],
+                        paragraph_search_score=match["_additional"]["certainty"],
+                        cross_encoding_score=0.0,
+                    )
+                )
+                continue
+
+            xenc_indices.append(len(best_matches))
+            xenc_inputs.append(
+                CrossEncodeInput(
+                    text=text,
+                    sentences=match["sentences"],
+                    sentence_numbers=match["sentence_numbers"],
+                )
             )
+            best_matches.append(None)  # filled in below
 
-        input = CrossEncodeInput(
-            text=text,
-            sentences=match["text"].split("</s><s>"),
-            sentence_numbers=match["sentence_numbers"],
-        )
+        if xenc_inputs:
+            outputs = self._xenc_batch(xenc_inputs)
+            for i, output in zip(xenc_indices, outputs):
+                match = matches[i]
+                best_matches[i] = SentenceMatch.from_cross_encode_output(
+                    output=output,
+                    document_id=match["doc_id"],
+                    paragraph_search_score=match["_additional"]["certainty"],
+                )
 
-        output = self._xenc(input)
-        return SentenceMatch.from_cross_encode_output(
-            output=output,
-            document_id=match["doc_id"],
-            paragraph_search_score=match["_additional"]["certainty"],
-        )
+        return [m for m in best_matches if m is not None]
@@ -1,20 +1,35 @@
 # -*- coding: utf-8 -*-
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
 
 import weaviate  # type: ignore (no stubs)
 
-from ...text import CrossEncodeFunc, CrossEncodeInput, EmbedFunc
+from ...text import (
+    CrossEncodeBatchFunc,
+    CrossEncodeFunc,
+    CrossEncodeInput,
+    EmbedBatchFunc,
+    EmbedFunc,
+    cross_encode_one_by_one,
+    embed_one_by_one,
+)
 from ..collections import Collections
 from ..paragraph import Filter, ParagraphV2, ParagraphV2Collection, SentenceMatch
+from ..semantic_cache import SemanticQueryCache
 from ..user_collection import Collection
 from .user_collection import (
     WeaviateObjectMapper,
     WeaviateUserCollection,
     get_data_objects,
+    split_sentences,
     user_id_eq,
 )
 
 
+# Upper bound on concurrent Weaviate queries in find_similar_sentences_many.
+_max_parallel_queries = 8
+
+
 def _search_filter_to_where_clause(filter: Filter) -> dict[str, Any]:
     operands = [user_id_eq(filter.user_id)]
 
@@ -46,7 +61,7 @@ def _search_filter_to_where_clause(filter: Filter) -> dict[str, Any]:
         )
 
     if filter.doc_type is not None:
-        if type(filter.doc_type) == str:
+        if isinstance(filter.doc_type, str):
             operands.append(
                 {
                     "path": ["doc_type"],
@@ -55,7 +70,7 @@ def _search_filter_to_where_clause(filter: Filter) -> dict[str, Any]:
                 }
             )
         # multiple concurrent types
-        if type(filter.doc_type) == list:
+        elif isinstance(filter.doc_type, list):
             operands.append(
                 {
                     "path": ["doc_type"],
@@ -122,10 +137,18 @@ class WeaviateParagraphV2Collection(
         embed_func: EmbedFunc,
         cross_encode_func: CrossEncodeFunc,
         collection: Collection = Collections.Paragraph_v20231120,
+        embed_batch_func: Optional[EmbedBatchFunc] = None,
+        cross_encode_batch_func: Optional[CrossEncodeBatchFunc] = None,
+        query_cache: Optional[SemanticQueryCache[list[dict[str, Any]]]] = None,
     ) -> None:
         super().__init__(client, collection, WeaviateParagraphV2Mapper())
         self._embed = embed_func
-        self._xenc = cross_encode_func
+        self._embed_batch = embed_batch_func or embed_one_by_one(embed_func)
+        self._xenc_batch = cross_encode_batch_func or cross_encode_one_by_one(
+            cross_encode_func
+        )
+        # Optional: reuse the paragraphs found for near-identical queries.
+        self._query_cache = query_cache
 
     def find_similar_sentences(
         self,
@@ -137,10 +160,86 @@ class WeaviateParagraphV2Collection(
         # Embed the search text
         query_vector = self._embed(search_text)
 
+        matches = self._find_similar_paragraphs(
+            search_text,
+            query_vector,
+            filter,
+            limit_results,
+            hybrid_search_factor,
+        )
+
+        # Pick the best matching sentence from each paragraph.
+        best_matches = self._best_matches([(search_text, m) for m in matches])
+
+        return best_matches
+
+    def find_similar_sentences_many(
+        self,
+        queries: list[tuple[str, Filter, int]],
+        hybrid_search_factor: float = 1.0,
+    ) -> list[list[SentenceMatch]]:
+        if len(queries) == 0:
+            return []
+
+        # Embed all search texts at once.
+        query_vectors = self._embed_batch([text for text, _, _ in queries])
+
+        # Query the vector database for all of them concurrently.
+        with ThreadPoolExecutor(
+            max_workers=min(len(queries), _max_parallel_queries)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self._find_similar_paragraphs,
+                    text,
+                    query_vector,
+                    filter,
+                    limit_results,
+                    hybrid_search_factor,
+                )
+                for (text, filter, limit_results), query_vector in zip(
+                    queries, query_vectors
+                )
+            ]
+            all_matches = [future.result() for future in futures]
+
+        # Pick the best matching sentence from each paragraph, cross-encoding
+        # the paragraphs of all queries together.
+        best_matches = iter(
+            self._best_matches(
+                [
+                    (text, m)
+                    for (text, _, _), matches in zip(queries, all_matches)
+                    for m in matches
+                ]
+            )
+        )
+        return [
+            [next(best_matches) for _ in matches] for matches in all_matches
+        ]
+
+    def _find_similar_paragraphs(
+        self,
+        search_text: str,
+        query_vector: list[float],
+        filter: Filter,
+        limit_results: int,
+        hybrid_search_factor: float,
+    ) -> list[dict[str, Any]]:
+        # Filters are dataclasses (not hashable); their repr is a stable key.
+        # Below alpha 1 the BM25 half of the hybrid score depends on the exact
+        # search text, so a similar vector alone does not imply the same hits.
+        exact_text = search_text if hybrid_search_factor < 1.0 else None
+        cache_key = (repr(filter), limit_results, hybrid_search_factor, exact_text)
+        if self._query_cache is not None:
+            cached = self._query_cache.get(cache_key, query_vector)
+            if cached is not None:
+                return cached
+
         # Query the vector database for similar paragraphs.
-        collection_name = self.collection_class.name
+        collection_name = self._collection_name
         result: dict[str, Any] = (
-            self._client.query.get(collection_name, self._mapper.fields())
+            self._client.query.get(collection_name, self._fields)
             .with_where(_search_filter_to_where_clause(filter))
             .with_hybrid(
                 query=search_text,
@@ -148,45 +247,67 @@ class WeaviateParagraphV2Collection(
                 properties=["text"],  # restrict to text only, not e.g. titles
                 alpha=hybrid_search_factor,
             )
-            .with_additional(self._mapper.additional_fields())
+            .with_additional(self._search_additional_fields)
             .with_limit(limit_results)
             .do()
         )
-        matches = get_data_objects(
-            result,
-            collection_name,
-            description=lambda: f"find similar sentences for user_id={filter.user_id}",
+        matches = split_sentences(
+            get_data_objects(
+                result,
+                collection_name,
+                description=lambda: f"find similar sentences for user_id={filter.user_id}",
+            )
         )
 
-        # Pick the best matching sentence from each paragraph.
-        best_matches = [self._best_match(search_text, m) for m in matches]
+        if self._query_cache is not None:
+            self._query_cache.put(cache_key, query_vector, matches)
 
-        return best_matches
+        return matches
 
-    def _best_match(
+    def _best_matches(
         self,
-        text: str,
-        match: dict[str, Any],
-    ) -> SentenceMatch:
-        # No need to cross-encode if there's only one match.
-        if len(match["sentence_numbers"]) == 1:
-            return SentenceMatch(
-                document_id=match["doc_id"],
-                sentence_number=match["sentence_numbers"][0],
-                sentence=match["text"],
-                paragraph_search_score=match["_additional"]["score"],
-                cross_encoding_score=0.0,
+        text_matches: list[tuple[str, dict[str, Any]]],
+    ) -> list[SentenceMatch]:
+        """
+        Pick the best matching sentence from each (search text, paragraph)
+        pair, cross-encoding all paragraphs that need it in a single batch.
+        """
+        best_matches: list[Optional[SentenceMatch]] = []
+        xenc_indices: list[int] = []
+        xenc_inputs: list[CrossEncodeInput] = []
+
+        for text, match in text_matches:
+            # No need to cross-encode if there's only one match.
+            if len(match["sentence_numbers"]) == 1:
+                best_matches.append(
+                    SentenceMatch(
+                        document_id=match["doc_id"],
+                        sentence_number=match["sentence_numbers"][0],
+                        sentence=match["text"],
+                        paragraph_search_score=match["_additional"]["score"],
+                        cross_encoding_score=0.0,
+                    )
+                )
+                continue
+
+            xenc_indices.append(len(best_matches))
+            xenc_inputs.append(
+                CrossEncodeInput(
+                    text=text,
+                    sentences=match["sentences"],
+                    sentence_numbers=match["sentence_numbers"],
+                )
             )
+            best_matches.append(None)  # filled in below
 
-        input = CrossEncodeInput(
-            text=text,
-            sentences=match["text"].split("</s><s>"),
-            sentence_numbers=match["sentence_numbers"],
-        )
+        if xenc_inputs:
+            outputs = self._xenc_batch(xenc_inputs)
+            for i, output in zip(xenc_indices, outputs):
+                match = text_matches[i][1]
+                best_matches[i] = SentenceMatch.from_cross_encode_output(
+                    output=output,
+                    document_id=match["doc_id"],
+                    paragraph_search_score=match["_additional"]["score"],
+                )
 
-        output = self._xenc(input)
-        return SentenceMatch.from_cross_encode_output(
-            output=output,
-            document_id=match["doc_id"],
-            paragraph_search_score=match["_additional"]["score"],
-        )
+        return [m for m in best_matches if m is not None]
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
-from typing import Any, Callable, Generic, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Generic, Iterator, Optional
 from uuid import UUID
 
 import weaviate  # type: ignore (no stubs)
@@ -16,9 +18,6 @@ from .data_object import WeaviateObjectMapper
 logger.configure(**LOG_CONFIG)
 
 
-_batch_delete_limit = 10_000
-
-
 def id_eq(id: UUID) -> dict[str, Any]:
     return {
         "path": ["id"],
@@ -27,6 +26,14 @@ def id_eq(id: UUID) -> dict[str, Any]:
     }
 
 
+def id_in(ids: list[UUID]) -> dict[str, Any]:
+    return {
+        "path": ["id"],
+        "operator": "ContainsAny",
+        "valueText": [str(id) for id in ids],
+    }
+
+
 def user_id_eq(user_id: UUID) -> dict[str, Any]:
     return {
         "path": ["user_id"],
@@ -67,9 +74,20 @@ class WeaviateUserCollection(
         self._client = client
         self._collection_class = collection_class
         self._mapper = mapper
+        # Constant for the lifetime of the collection; resolved once rather
+        # than on every query.
+        self._collection_name = collection_class.name
+        self._fields = mapper.fields()
+        self._additional_fields = mapper.additional_fields()
+        # Additional fields for searches (as opposed to reads of whole objects):
+        # e.g. the score of each match, but not its vector, which would
+        # otherwise dominate the size and JSON decoding time of the response.
+        self._search_additional_fields = [
+            field for field in self._additional_fields if field != "vector"
+        ]
 
     def create(self, object: CollectionObjectType) -> None:
-        collection_name = self._collection_class.name
+        collection_name = self._collection_name
         data_object = self._mapper.to_weaviate(object)
 
         self._client.data_object.create(
@@ -83,7 +101,7 @@ class WeaviateUserCollection(
         if len(objects) == 0:
             raise ValueError("empty list of objects supplied")
 
-        collection_name = self._collection_class.name
+        collection_name = self._collection_name
         batch_callback = _BatchCallback()
 
         self._client.batch.configure(
@@ -92,6 +110,10 @@ class WeaviateUserCollection(
             batch_size=20,
             # dynamically update the `batch_size` based on import speed
             dynamic=True,
+            # Keep up to 2 batch requests in flight, so the next batch is
+            # prepared (objects serialized and added) while the previous one
+            # is being sent, rather than strictly one after the other.
+            num_workers=2,
             timeout_retries=3,
             connection_error_retries=3,
             weaviate_error_retries=weaviate.WeaviateErrorRetryConf(number_retries=3),
@@ -142,11 +164,11 @@ class WeaviateUserCollection(
         # else all records were successfully created
 
     def get_by_id(self, id: UUID) -> Optional[CollectionObjectType]:
-        collection_name = self._collection_class.name
+        collection_name = self._collection_name
         result: dict[str, Any] = (
-            self._client.query.get(collection_name, self._mapper.fields())
+            self._client.query.get(collection_name, self._fields)
             .with_where(id_eq(id))
-            .with_additional(self._mapper.additional_fields())
+            .with_additional(self._additional_fields)
             .do()
         )
 
@@ -165,6 +187,31 @@ class WeaviateUserCollection(
 
         return self._mapper.from_weaviate(data_objects[0])
 
+    def get_many_by_ids(
+        self,
+        ids: list[UUID],
+    ) -> dict[UUID, CollectionObjectType]:
+        if len(ids) == 0:
+            return {}
+
+        collection_name = self._collection_name
+        result: dict[str, Any] = (
+            self._client.query.get(collection_name, self._fields)
+            .with_where(id_in(ids))
+            .with_additional(self._additional_fields)
+            .with_limit(len(ids))
+            .do()
+        )
+
+        data_objects = get_data_objects(
+            result,
+            collection_name,
+            description=lambda: f"read {len(ids)} {collection_name} by id",
+        )
+
+        objects = [self._mapper.from_weaviate(do) for do in data_objects]
+        return {obj.id: obj for obj in objects}
+
     # FIXME this will fail if offset+limit > QUERY_MAXIMUM_RESULTS of weaviate,
     # which is currently defaulting to 100_000
     def get_by_user_id(
@@ -173,11 +220,11 @@ class WeaviateUserCollection(
         offset: int = 0,
         limit: int = 50,
     ) -> list[CollectionObjectType]:
-        collection_name = self._collection_class.name
+        collection_name = self._collection_name
         result: dict[str, Any] = (
-            self._client.query.get(collection_name, self._mapper.fields())
+            self._client.query.get(collection_name, self._fields)
             .with_where(user_id_eq(user_id))
-            .with_additional(self._mapper.additional_fields())
+            .with_additional(self._additional_fields)
             .with_offset(offset)
             .with_limit(limit)
             .do()
@@ -194,6 +241,37 @@ class WeaviateUserCollection(
 
         return [self._mapper.from_weaviate(do) for do in data_objects]
 
+    # FIXME same QUERY_MAXIMUM_RESULTS limitation as get_by_user_id
+    def iter_by_user_id(
+        self,
+        user_id: UUID,
+        page_size: int = 100,
+        max_in_flight: int = 4,
+    ) -> Iterator[CollectionObjectType]:
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+
+            def fetch(page: int) -> Future[list[CollectionObjectType]]:
+                return executor.submit(
+                    self.get_by_user_id,
+                    user_id,
+                    offset=page * page_size,
+                    limit=page_size,
+                )
+
+            # Keep up to max_in_flight pages in flight, but yield them in order.
+            pending = deque(fetch(page) for page in range(max_in_flight))
+            next_page = max_in_flight
+            while pending:
+                objects = pending.popleft().result()
+                yield from objects
+
+                if len(objects) < page_size:
+                    # Last page; any pages still in flight are past the end.
+                    break
+
+                pending.append(fetch(next_page))
+                next_page += 1
+
     def get_by_user_id_doc_id(
         self,
         user_id: UUID,
@@ -201,11 +279,11 @@ class WeaviateUserCollection(
         offset: int = 0,
         limit: int = 50,
     ) -> list[CollectionObjectType]:
-        collection_name = self._collection_class.name
+        collection_name = self._collection_name
         result: dict[str, Any] = (
-            self._client.query.get(collection_name, self._mapper.fields())
+            self._client.query.get(collection_name, self._fields)
             .with_where(user_id_doc_id_eq(user_id, doc_id))
-            .with_additional(self._mapper.additional_fields())
+            .with_additional(self._additional_fields)
             .with_offset(offset)
             .with_limit(limit)
             .do()
@@ -223,7 +301,7 @@ class WeaviateUserCollection(
         return [self._mapper.from_weaviate(do) for do in data_objects]
 
     def count(self) -> int:
-        collection_name = self._collection_class.name
+        collection_name = self._collection_name
         result: dict[str, Any] = (
             self._client.query.aggregate(collection_name).with_meta_count().do()
         )
@@ -237,7 +315,7 @@ class WeaviateUserCollection(
         return int(aggregate_data[0]["meta"]["count"])
 
     def count_by_user_id(self, user_id: UUID) -> int:
-        collection_name = self._collection_class.name
+        collection_name = self._collection_name
         result: dict[str, Any] = (
             self._client.query.aggregate(collection_name)
             .with_where(user_id_eq(user_id))
@@ -254,7 +332,7 @@ class WeaviateUserCollection(
         return int(aggregate_data[0]["meta"]["count"])
 
     def delete_by_user_id(self, user_id: UUID) -> int:
-        collection_name = self._collection_class.name
+        collection_name = self._collection_name
         total = 0
         while True:
             result: dict[str, Any] = self._client.batch.delete_objects(
@@ -270,9 +348,14 @@ class WeaviateUserCollection(
                 )
 
             total += ok
-            # Weaviate has an upper limit of 10k objects per batch delete. If
-            # fewer were matched, all vectors were deleted.
-            if ok < _batch_delete_limit:
+            # Weaviate has an upper limit of objects per batch delete (10k by
+            # default, but configurable server-side, hence read from the
+            # response). If fewer were matched, all vectors were deleted.
+            #
+            # NB: Batches are deliberately not issued concurrently: they all
+            # match the same filter, so in-flight batches would race to delete
+            # the same (first) objects rather than disjoint sets.
+            if int(result["results"]["matches"]) < int(result["results"]["limit"]):
                 break
 
         return total
@@ -283,15 +366,21 @@ class WeaviateUserCollection(
 
 
 class _BatchCallback:
-    errors: list[str] = []
+    errors: list[str]
+
+    def __init__(self) -> None:
+        # Per instance (i.e. per create_many call); a class-level list would be
+        # shared, and grow, across all batches in the process.
+        self.errors = []
 
     def __call__(self, results: list[dict[str, Any]] | None):
-        if results is not None:
-            for result in results:
-                if "result" in result and "errors" in result["result"]:
-                    if "error" in result["result"]["errors"]:
-                        error_msg = str(result["result"]["errors"]["error"])
-                        self.errors.append(error_msg)
+        if not results:
+            return
+
+        for result in results:
+            errors = result.get("result", {}).get("errors")
+            if errors is not None and "error" in errors:
+                self.errors.append(str(errors["error"]))
 
 
 def get_data_objects(
@@ -304,6 +393,17 @@ def get_data_objects(
     return result["data"]["Get"][collection_name]
 
 
+def split_sentences(matches: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Split the text of each matched paragraph into its sentences, stored under
+    "sentences". Done once per fetched paragraph, so that paragraphs reused
+    from a query cache aren't split again on every search.
+    """
+    for match in matches:
+        match["sentences"] = match["text"].split("</s><s>")
+    return matches
+
+
 def get_aggregate_data(
     result: dict[str, Any],
     collection_name: str,
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 import os
 
+# The environment doesn't change over the lifetime of a process; read it once
+# so the checks below (some on per-request paths) are plain comparisons.
+_ENV = os.getenv("ENV")
+
 
 def require_str(name: str) -> str:
     """Get an environment variable or raise an exception."""
@@ -13,8 +17,14 @@ def require_str(name: str) -> str:
 
 
 def is_local_development() -> bool:
-    return os.getenv("ENV") == "local"
+    return _ENV == "local"
 
 
 def is_production() -> bool:
-    return os.getenv("ENV") == "prod"
+    return _ENV == "prod"
+
+
+def reload_env() -> None:
+    """Re-read the ENV variable, e.g. after tests change it mid-process."""
+    global _ENV
+    _ENV = os.getenv("ENV")
@@ -39,8 +39,10 @@ def get() -> Features:
     initializing it if necessary.
     """
     global _features
-    global _lock
 
+    # Fast path: a single module global read once initialized. (Not an
+    # lru_cache: it doesn't guarantee the initializer runs only once under
+    # concurrent first calls, and each LDFeatures starts its own client.)
     if _features is not None:
         return _features
 
@@ -96,6 +96,40 @@ class Permission(BaseToggle, ABC):
         pass
 
 
+class Snapshot:
+    """
+    Values of feature toggles for one context (the user or actor that
+    experiments and permissions are checked for), for code that checks
+    several toggles while handling a request. Release, operational and
+    killswitch toggles don't depend on the context.
+
+    This default implementation evaluates each toggle when it's checked;
+    `Features` implementations can override `Features.snapshot` to fetch all
+    values at once.
+    """
+
+    def __init__(self, features: "Features", ctx_key: str) -> None:
+        self._features = features
+        self._ctx_key = ctx_key
+
+    def release(self, key: str, default_enabled: bool = False) -> bool:
+        return self._features.release(key, default_enabled).is_enabled()
+
+    def experiment(self, key: str, default_enabled: bool = False) -> bool:
+        toggle = self._features.experiment(key, default_enabled)
+        return toggle.is_enabled(self._ctx_key)
+
+    def operational(self, key: str, type_cls: type[T], default_value: T) -> T:
+        return self._features.operational(key, type_cls, default_value).get()
+
+    def killswitch(self, key: str) -> bool:
+        return self._features.killswitch(key).is_enabled()
+
+    def permission(self, key: str, default_allowed: bool = False) -> bool:
+        toggle = self._features.permission(key, default_allowed)
+        return toggle.is_allowed(self._ctx_key)
+
+
 class Features(ABC):
     """
     Contract for a source of feature toggles.
@@ -139,3 +173,10 @@ class Features(ABC):
         default_allowed: bool = False,
     ) -> Permission:
         pass
+
+    def snapshot(self, ctx_key: str = "default") -> Snapshot:
+        """
+        Values of all toggles for a context (user or actor key), for checking
+        several toggles at once.
+        """
+        return Snapshot(self, ctx_key)
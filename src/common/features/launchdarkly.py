@@ -1,18 +1,41 @@
 # -*- coding: utf-8 -*-
+import functools
+import threading
+import time
 from abc import ABC
+from collections import OrderedDict
 from dataclasses import is_dataclass
-from typing import Optional, TypeVar
+from typing import Any, Callable, Optional, TypeVar
 from venv import logger
 
 import ldclient
 import ldclient.evaluation
 
-from .features import Experiment, Features, Killswitch, Operational, Permission, Release
+from .features import (
+    Experiment,
+    Features,
+    Killswitch,
+    Operational,
+    Permission,
+    Release,
+    Snapshot,
+)
 from .types import check_expected_value_type, check_valid_type
 
 # Timeout to wait for a successful connection to LaunchDarkly (or relay proxy).
 _LD_CONNECTION_TIMEOUT_SECS = 5
 
+# How long a flag evaluation is reused for the same context, by default.
+_DEFAULT_CACHE_TTL_SECS = 2.0
+
+# Upper bound on cached flag evaluations (flags x contexts x defaults).
+_CACHE_MAX_ENTRIES = 10_000
+
+# Contexts are immutable, so the one used by flags that don't vary by user is
+# shared by all evaluations.
+_DEFAULT_CTX_KEY = "default"
+_DEFAULT_CTX = ldclient.Context.create(_DEFAULT_CTX_KEY)
+
 T = TypeVar("T")
 
 
@@ -20,7 +43,8 @@ def _eval(
     key: str,
     ctx: ldclient.Context,
     client: ldclient.LDClient,
-    type_cls: type[T],
+    value_type: type,
+    build: Callable[[Any], T],
     default: Optional[T] = None,
 ) -> T:
     """
@@ -30,7 +54,10 @@ def _eval(
         key (str): The key of the feature flag to evaluate.
         ctx (ldclient.Context): The context to use for evaluation.
         client (ldclient.LDClient): The LaunchDarkly client instance to use for evaluation.
-        type_cls (type[T]): The expected type of the flag value.
+        value_type (type): The expected type of the flag value, as returned by
+            the SDK.
+        build (Callable[[Any], T]): Converts the flag value to the feature's
+            type.
         default (Optional[T], optional): The default value to use if the flag evaluation fails.
             Defaults to None.
 
@@ -41,9 +68,6 @@ def _eval(
         Exception: If the flag evaluation fails and no default value is specified.
     """
 
-    # Overzealous checks against programmer error.
-    check_valid_type(key, type_cls, default)
-
     # Evaluate the flag.
     detail = client.variation_detail(key, ctx, default=None)
     err_kind: Optional[str] = detail.reason.get("errorKind", None)
@@ -58,56 +82,177 @@ def _eval(
                 f"returning default value ({default})"
             )
 
-    ret_val = detail.value or default
+    # NB: ret_val cannot be None since:
+    # - if the flag eval succeeds, detail.value will always have a value.
+    # - if the flag eval fails, err_kind check above will either raise or
+    #   guarantee a default value.
+    return _to_value(key, detail.value, value_type, build, default)
+
+
+def _to_value(
+    key: str,
+    value: Any,
+    value_type: type,
+    build: Callable[[Any], T],
+    default: Optional[T] = None,
+) -> T:
+    """Check the type of an evaluated flag value and convert it."""
+    ret_val = value or default
     if ret_val is None:
-        # NB: This cannot happen since:
-        # - if the flag eval succeeds, detail.value will always have a value.
-        # - if the flag eval fails, err_kind check above will either raise or
-        #   guarantee a default value.
         raise Exception(
             f"error evaluating {key}: "
             "evaluation returned None and no default value specified"
         )
 
+    check_expected_value_type(key, value_type, ret_val)
+    return build(ret_val)
+
+
+def _converter(type_cls: type[T]) -> tuple[type, Callable[[Any], T]]:
+    """
+    Returns the type of flag value the SDK is expected to return for a
+    feature of type `type_cls`, and a function to convert it to `type_cls`.
+    """
     if is_dataclass(type_cls):
         # When type_cls is a dataclass, expect flag value type to be JSON. These
         # are returned as a dict by the LaunchDarkly SDK.
-        check_expected_value_type(key, dict, ret_val)
-        return type_cls(**ret_val)
+        return dict, lambda value: type_cls(**value)
     else:
         # Otherwise, we assume the flag value type to be a primitive type
-        check_expected_value_type(key, type_cls, ret_val)
-        return type_cls(ret_val)
+        return type_cls, type_cls
+
+
+@functools.lru_cache(maxsize=4096)
+def _ctx_for(key: str) -> ldclient.Context:
+    """Returns a (shared) evaluation context for a user or actor key."""
+    return ldclient.Context.create(key)
+
+
+class _EvalCache:
+    """
+    Short-lived, in-process cache of flag evaluations, keyed by flag, context
+    key and default value, so that flags checked in hot code paths resolve
+    from a dict lookup instead of a full SDK evaluation.
+
+    Entries for a flag are dropped when LaunchDarkly reports a change to it,
+    where the SDK supports it; otherwise they expire after `ttl_secs`. At most
+    `max_entries` are kept; the least recently used ones are evicted first.
+    """
+
+    def __init__(self, ttl_secs: float, max_entries: int = _CACHE_MAX_ENTRIES):
+        self._ttl = ttl_secs
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str, str], tuple[float, Any]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get_or_eval(
+        self,
+        key: str,
+        ctx_key: str,
+        default_key: str,
+        evaluate: Callable[[], T],
+    ) -> T:
+        """
+        Return the cached evaluation of flag `key` for context `ctx_key` with
+        the default value identified by `default_key`, calling `evaluate` on a
+        miss.
+        """
+        if self._ttl <= 0:
+            return evaluate()
+
+        cache_key = (key, ctx_key, default_key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and now - entry[0] < self._ttl:
+                self._entries.move_to_end(cache_key)
+                return entry[1]
+
+        # Evaluated outside the lock: concurrent misses for the same flag may
+        # evaluate it more than once, which is harmless.
+        value = evaluate()
+        with self._lock:
+            self._entries[cache_key] = (now, value)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] == key]:
+                del self._entries[cache_key]
 
 
 class _LDFeature(ABC):
-    def __init__(self, key: str, client: ldclient.LDClient):
+    def __init__(
+        self,
+        key: str,
+        client: ldclient.LDClient,
+        cache: _EvalCache,
+        type_cls: type,
+        default: Optional[Any],
+    ):
+        # Overzealous checks against programmer error; type_cls and default
+        # are fixed, so once per feature rather than on every evaluation.
+        check_valid_type(key, type_cls, default)
+
         self._key = key
         self._client = client
+        self._cache = cache
+        self._default = default
+        # Dataclass defaults aren't hashable; their repr identifies them.
+        self._default_key = repr(default)
+        self._value_type, self._build = _converter(type_cls)
 
     @property
     def key(self) -> str:
         return self._key
 
+    def _eval(self, ctx: ldclient.Context) -> Any:
+        return self._cache.get_or_eval(
+            self._key,
+            ctx.key,
+            self._default_key,
+            lambda: _eval(
+                self._key,
+                ctx,
+                self._client,
+                self._value_type,
+                self._build,
+                self._default,
+            ),
+        )
+
 
 class _LDRelease(_LDFeature, Release):
-    def __init__(self, key: str, client: ldclient.LDClient, default: bool):
-        super().__init__(key, client)
-        self._default = default
+    def __init__(
+        self,
+        key: str,
+        client: ldclient.LDClient,
+        cache: _EvalCache,
+        default: bool,
+    ):
+        super().__init__(key, client, cache, bool, default)
 
     def is_enabled(self) -> bool:
-        ctx = ldclient.Context.create("default")
-        return _eval(self.key, ctx, self._client, bool, self._default)
+        return self._eval(_DEFAULT_CTX)
 
 
 class _LDExperiment(_LDFeature, Experiment):
-    def __init__(self, key: str, client: ldclient.LDClient, default: bool):
-        super().__init__(key, client)
-        self._default = default
+    def __init__(
+        self,
+        key: str,
+        client: ldclient.LDClient,
+        cache: _EvalCache,
+        default: bool,
+    ):
+        super().__init__(key, client, cache, bool, default)
 
     def is_enabled(self, user: str) -> bool:
-        ctx = ldclient.Context.create(user)
-        return _eval(self.key, ctx, self._client, bool, self._default)
+        return self._eval(_ctx_for(user))
 
 
 class _LDOperational(_LDFeature, Operational[T]):
@@ -115,59 +260,131 @@ class _LDOperational(_LDFeature, Operational[T]):
         self,
         key: str,
         client: ldclient.LDClient,
+        cache: _EvalCache,
         type_cls: type[T],
         default: T,
     ):
-        super().__init__(key, client)
-        self._type_cls = type_cls
-        self._default = default
+        super().__init__(key, client, cache, type_cls, default)
 
     def get(self) -> T:
-        ctx = ldclient.Context.create("default")
-        return _eval(self.key, ctx, self._client, self._type_cls, self._default)
+        return self._eval(_DEFAULT_CTX)
 
 
 class _LDKillswitch(_LDFeature, Killswitch):
-    def __init__(self, key: str, client: ldclient.LDClient):
-        super().__init__(key, client)
+    def __init__(self, key: str, client: ldclient.LDClient, cache: _EvalCache):
+        super().__init__(key, client, cache, bool, False)
 
     def is_enabled(self):
-        ctx = ldclient.Context.create("default")
-        return _eval(self.key, ctx, self._client, bool, False)
+        return self._eval(_DEFAULT_CTX)
 
 
 class _LDPermission(_LDFeature, Permission):
-    def __init__(self, key: str, client: ldclient.LDClient, default: bool):
-        super().__init__(key, client)
-        self._default = default
+    def __init__(
+        self,
+        key: str,
+        client: ldclient.LDClient,
+        cache: _EvalCache,
+        default: bool,
+    ):
+        super().__init__(key, client, cache, bool, default)
 
     def is_allowed(self, actor: str) -> bool:
-        ctx = ldclient.Context.create(actor)
-        return _eval(self.key, ctx, self._client, bool, self._default)
+        return self._eval(_ctx_for(actor))
+
+
+class _LDSnapshot(Snapshot):
+    """
+    Values of all flags for one context, fetched with a single SDK call.
+
+    Release, operational and killswitch flags are evaluated for the default
+    context; they're only read from the snapshot when it was taken for that
+    context. Flags missing from the snapshot (e.g. added since it was taken)
+    are evaluated individually.
+    """
+
+    def __init__(self, features: Features, client: ldclient.LDClient, ctx_key: str):
+        super().__init__(features, ctx_key)
+        self._client = client
+        self._ctx = _ctx_for(ctx_key)
+        self._is_default_ctx = ctx_key == _DEFAULT_CTX_KEY
+        state = client.all_flags_state(self._ctx)
+        self._values: dict[str, Any] = state.to_values_map() if state.valid else {}
+
+    def release(self, key: str, default_enabled: bool = False) -> bool:
+        if not self._is_default_ctx:
+            return super().release(key, default_enabled)
+        return self._get(f"release.{key}", bool, default_enabled)
+
+    def experiment(self, key: str, default_enabled: bool = False) -> bool:
+        return self._get(f"experiment.{key}", bool, default_enabled)
+
+    def operational(self, key: str, type_cls: type[T], default_value: T) -> T:
+        if not self._is_default_ctx:
+            return super().operational(key, type_cls, default_value)
+        return self._get(f"operational.{key}", type_cls, default_value)
+
+    def killswitch(self, key: str) -> bool:
+        if not self._is_default_ctx:
+            return super().killswitch(key)
+        return self._get(f"killswitch.{key}", bool, False)
+
+    def permission(self, key: str, default_allowed: bool = False) -> bool:
+        return self._get(f"permission.{key}", bool, default_allowed)
+
+    def _get(self, key: str, type_cls: type[T], default: T) -> T:
+        check_valid_type(key, type_cls, default)
+        value_type, build = _converter(type_cls)
+        if key not in self._values:
+            return _eval(key, self._ctx, self._client, value_type, build, default)
+        return _to_value(key, self._values[key], value_type, build, default)
 
 
 class LDFeatures(Features):
     """LaunchDarkly implementation for Features."""
 
-    def __init__(self, config: ldclient.Config):
+    def __init__(
+        self,
+        config: ldclient.Config,
+        cache_ttl_secs: float = _DEFAULT_CACHE_TTL_SECS,
+    ):
+        """
+        Args:
+            config (ldclient.Config): LaunchDarkly client configuration.
+            cache_ttl_secs (float, optional): How long a flag evaluation for
+                a given context is reused before evaluating the flag again.
+                Set to 0 to always evaluate. Defaults to 2 seconds.
+        """
         self._client = ldclient.LDClient(
             config=config,
             start_wait=_LD_CONNECTION_TIMEOUT_SECS,
         )
+        self._cache = _EvalCache(cache_ttl_secs)
+        self._client.flag_tracker.add_listener(
+            lambda change: self._cache.invalidate(change.key)
+        )
+
+    def snapshot(self, ctx_key: str = _DEFAULT_CTX_KEY) -> Snapshot:
+        """Fetch the values of all flags for a context with a single call."""
+        return _LDSnapshot(self, self._client, ctx_key)
 
     def release(
         self,
         key: str,
         default_enabled: bool = False,
     ) -> Release:
-        return _LDRelease(f"release.{key}", self._client, default_enabled)
+        return _LDRelease(f"release.{key}", self._client, self._cache, default_enabled)
 
     def experiment(
         self,
         key: str,
         default_enabled: bool = False,
     ) -> Experiment:
-        return _LDExperiment(f"experiment.{key}", self._client, default_enabled)
+        return _LDExperiment(
+            f"experiment.{key}",
+            self._client,
+            self._cache,
+            default_enabled,
+        )
 
     def operational(
         self,
@@ -175,16 +392,25 @@ class LDFeatures(Features):
         type_cls: type[T],
         default_value: T,
     ) -> Operational[T]:
-        key = f"operational.{key}"
-        check_valid_type(key, type_cls, None)
-        return _LDOperational(key, self._client, type_cls, default_value)
+        return _LDOperational(
+            f"operational.{key}",
+            self._client,
+            self._cache,
+            type_cls,
+            default_value,
+        )
 
     def killswitch(self, key: str) -> Killswitch:
-        return _LDKillswitch(f"killswitch.{key}", self._client)
+        return _LDKillswitch(f"killswitch.{key}", self._client, self._cache)
 
     def permission(
         self,
         key: str,
         default_allowed: bool = False,
     ) -> Permission:
-        return _LDPermission(f"permission.{key}", self._client, default_allowed)
+        return _LDPermission(
+            f"permission.{key}",
+            self._client,
+            self._cache,
+            default_allowed,
+        )
@@ -4,6 +4,8 @@ from typing import Optional, TypeVar
 
 T = TypeVar("T")
 
+_PRIMITIVE_TYPES = frozenset({bool, str, int})
+
 
 def check_valid_type(
     flag_key: str,
@@ -24,14 +26,18 @@ def check_valid_type(
     """
 
     # Only allow a few primitive types and dataclasses.
-    if not type_cls in (bool, str, int) and not is_dataclass(type_cls):
+    if type_cls not in _PRIMITIVE_TYPES and not is_dataclass(type_cls):
         raise TypeError(
             f"unsupported type {type_cls.__name__} for flag {flag_key} "
             "(must be bool, str, int or dataclass)"
         )
 
-    # When a value is provided, check that its type matches type_cls.
-    if default is not None and type(default) != type_cls:
+    # When a value is provided, check that its type matches type_cls. (bool is
+    # a subclass of int, but not a valid default for an int flag.)
+    if default is not None and (
+        not isinstance(default, type_cls)
+        or (type_cls is int and isinstance(default, bool))
+    ):
         raise TypeError(
             f"expected default value to be {type_cls.__name__} "
             f"for flag {flag_key}, got {type(default).__name__}"
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import re
 from datetime import datetime
 from textwrap import dedent
 from typing import Any, LiteralString, cast
@@ -26,6 +27,18 @@ from ..user_graph import UserGraph
 #    "WORK_OF_ART",
 # }
 
+# Labels, relationship types and property keys can't be passed as query
+# parameters, so they're interpolated into queries; only allow plain names.
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def _identifier(name: str) -> str:
+    """Returns `name` if it's safe to interpolate into a query as a label,
+    relationship type or property key; raises ValueError otherwise."""
+    if not _IDENTIFIER.fullmatch(name):
+        raise ValueError(f"invalid identifier for a graph query: {name!r}")
+    return name
+
 
 class Neo4jUserGraph(
     UserGraph[NodeType, EdgeType],
@@ -62,10 +75,10 @@ class Neo4jUserGraph(
         # sanity check
         assert start_node.user_id == end_node.user_id == edge.user_id
 
-        with self._client as driver, driver.session(database="neo4j") as session:
+        with self._client.session(database="neo4j") as session:
             properties = edge.model_dump(mode="json")
             directed = properties.pop("directed")
-            relationship_type = properties.pop("relationship_type")
+            relationship_type = _identifier(properties.pop("relationship_type"))
 
             if directed:
                 connector_ascii = "->"
@@ -74,11 +87,19 @@ class Neo4jUserGraph(
 
             query_str = (
                 "MATCH (startNode), (endNode) "
-                f"WHERE startNode.id='{start_node.id}' AND endNode.id='{end_node.id}' "
+                "WHERE startNode.id = $start_id AND endNode.id = $end_id "
                 f"MERGE (startNode)-[r:{relationship_type}]{connector_ascii}(endNode) "
                 "SET r += $properties;"
             )
-            self._run_query(session, query_str, parameters={"properties": properties})
+            self._run_query(
+                session,
+                query_str,
+                parameters={
+                    "start_id": str(start_node.id),
+                    "end_id": str(end_node.id),
+                    "properties": properties,
+                },
+            )
 
     def bulk_upsert_and_connect_nodes(
         self,
@@ -100,10 +121,11 @@ class Neo4jUserGraph(
         with self._client.session(database="neo4j") as session:
             # Generate and run the dynamic query for each row in the data
             for row in data:
+                relationship = row["relationships"][0]
                 formatted_query = query_template.format(
-                    node_type=row["node"]["node_type"],
-                    target_node_type=row["relationships"][0]["target_node_type"],
-                    edge_type=row["relationships"][0]["edge_type"],
+                    node_type=_identifier(row["node"]["node_type"]),
+                    target_node_type=_identifier(relationship["target_node_type"]),
+                    edge_type=_identifier(relationship["edge_type"]),
                 )
                 self._run_query(session, formatted_query, parameters={"data": [row]})
 
@@ -123,10 +145,13 @@ class Neo4jUserGraph(
             embedding_vector = properties.pop(
                 "embedding_vector", None
             )  # don't use SET, see note above
-            label: str = properties.pop("node_type")
+            label = _identifier(properties.pop("node_type"))
+            node_id = str(node.id)
 
-            query_str = f"MATCH (n:{label}) WHERE n.id='{node.id}' RETURN COUNT(n) AS nodeCount;"
-            result = self._run_query(session, query_str)
+            query_str = (
+                f"MATCH (n:{label}) WHERE n.id = $id RETURN COUNT(n) AS nodeCount;"
+            )
+            result = self._run_query(session, query_str, parameters={"id": node_id})
             node_count = result.single(strict=True)["nodeCount"]
 
             if not node_count:
@@ -139,23 +164,23 @@ class Neo4jUserGraph(
             # if the node exists, update the properties (not all properties need to be used
             # as input when calculating the unique id, so this does have an effect)
             else:
-                query_str = f"MATCH (n:{label}) WHERE n.id='{id}' SET n += $properties;"
+                query_str = f"MATCH (n:{label}) WHERE n.id = $id SET n += $properties;"
                 self._run_query(
                     session,
                     query_str,
-                    parameters={"properties": properties},
+                    parameters={"id": node_id, "properties": properties},
                 )
 
             if embedding_vector is not None:
                 # add embedding vector as IEEE 754[2] single precision
                 query_str = (
-                    f"MATCH (n:{label}) WHERE n.id='{id}' "
+                    f"MATCH (n:{label}) WHERE n.id = $id "
                     "CALL db.create.setNodeVectorProperty(n, 'embedding_vector', $vector);"
                 )
                 self._run_query(
                     session,
                     query_str,
-                    parameters={"embedding_vector": embedding_vector},
+                    parameters={"id": node_id, "vector": embedding_vector},
                 )
 
             if label == "Artifact":
@@ -196,12 +221,13 @@ class Neo4jUserGraph(
                 )
 
     def get_node_by_id(self, id: UUID) -> Node:
-        with self._client as driver, driver.session(database="neo4j") as session:
-            query_str = f"MATCH (n) WHERE n.id = '{id}' RETURN n;"
+        with self._client.session(database="neo4j") as session:
+            query_str = "MATCH (n) WHERE n.id = $id RETURN n;"
 
             result = self._run_query(
                 session,
                 query_str,
+                parameters={"id": str(id)},
             )
             node = result.single(strict=True)["n"]
 
@@ -209,12 +235,13 @@ class Neo4jUserGraph(
 
     def get_edge_by_id(self, id: UUID) -> Edge:
         # TODO edge is assumed to be directed
-        with self._client as driver, driver.session(database="neo4j") as session:
-            query_str = f"MATCH ()-[r]->() WHERE r.id = '{id}' RETURN r;"
+        with self._client.session(database="neo4j") as session:
+            query_str = "MATCH ()-[r]->() WHERE r.id = $id RETURN r;"
 
             result = self._run_query(
                 session,
                 query_str,
+                parameters={"id": str(id)},
             )
             edge = result.single(strict=True)["r"]
 
@@ -223,15 +250,16 @@ class Neo4jUserGraph(
     def get_nodes_by_user_id(
         self, user_id: UUID, offset: int = 0, limit: int = 50
     ) -> list[NodeType]:
-        with self._client as driver, driver.session(database="neo4j") as session:
+        with self._client.session(database="neo4j") as session:
             query_str = (
-                f"MATCH (n) WHERE n.user_id = '{user_id}' RETURN n "
-                f"ORDER BY ID(n) SKIP {offset} LIMIT {limit};"
+                "MATCH (n) WHERE n.user_id = $user_id RETURN n "
+                "ORDER BY ID(n) SKIP $offset LIMIT $limit;"
             )
 
             results = self._run_query(
                 session,
                 query_str,
+                parameters={"user_id": str(user_id), "offset": offset, "limit": limit},
             )
             nodes = [result["n"] for result in results]
             nodes = [Neo4jUserGraph._map_node(n) for n in nodes]
@@ -241,15 +269,16 @@ class Neo4jUserGraph(
     def get_nodes_by_property_value(
         self, property: str, value: Any, offset: int = 0, limit: int = 50
     ) -> list[NodeType]:
-        with self._client as driver, driver.session(database="neo4j") as session:
+        with self._client.session(database="neo4j") as session:
             query_str = (
-                f"MATCH (n) WHERE n.{property}='{value}' RETURN n "
-                f"ORDER BY ID(n) SKIP {offset} LIMIT {limit};"
+                f"MATCH (n) WHERE n.{_identifier(property)} = $value RETURN n "
+                "ORDER BY ID(n) SKIP $offset LIMIT $limit;"
             )
 
             results = self._run_query(
                 session,
                 query_str,
+                parameters={"value": str(value), "offset": offset, "limit": limit},
             )
             nodes = [result["n"] for result in results]
             nodes = [Neo4jUserGraph._map_node(n) for n in nodes]
@@ -264,15 +293,17 @@ class Neo4jUserGraph(
         offset: int = 0,
         limit: int = 50,
     ) -> list[NodeType]:
-        with self._client as driver, driver.session(database="neo4j") as session:
+        with self._client.session(database="neo4j") as session:
             query_str = (
-                f"MATCH (n:{label}) WHERE n.{property}='{value}' RETURN n "
-                f"ORDER BY ID(n) SKIP {offset} LIMIT {limit};"
+                f"MATCH (n:{_identifier(label)}) "
+                f"WHERE n.{_identifier(property)} = $value RETURN n "
+                "ORDER BY ID(n) SKIP $offset LIMIT $limit;"
             )
 
             results = self._run_query(
                 session,
                 query_str,
+                parameters={"value": str(value), "offset": offset, "limit": limit},
             )
             nodes = [result["n"] for result in results]
             nodes = [Neo4jUserGraph._map_node(n) for n in nodes]
@@ -282,17 +313,21 @@ class Neo4jUserGraph(
     def nodes(
         self, label: str | None = None, offset: int = 0, limit: int = 50
     ) -> list[NodeType]:
-        with self._client as driver, driver.session(database="neo4j") as session:
+        with self._client.session(database="neo4j") as session:
             if label is None:
                 query_str = (
-                    f"MATCH (n) RETURN n ORDER BY ID(n) SKIP {offset} LIMIT {limit};"
+                    "MATCH (n) RETURN n ORDER BY ID(n) SKIP $offset LIMIT $limit;"
                 )
             else:
-                query_str = f"MATCH (n:{label}) RETURN n ORDER BY ID(n) SKIP {offset} LIMIT {limit};"
+                query_str = (
+                    f"MATCH (n:{_identifier(label)}) RETURN n "
+                    "ORDER BY ID(n) SKIP $offset LIMIT $limit;"
+                )
 
             results = self._run_query(
                 session,
                 query_str,
+                parameters={"offset": offset, "limit": limit},
             )
             nodes = [result["n"] for result in results]
             nodes = [Neo4jUserGraph._map_node(n) for n in nodes]
@@ -302,15 +337,16 @@ class Neo4jUserGraph(
     def get_edges_by_user_id(
         self, user_id: UUID, offset: int = 0, limit: int = 50
     ) -> list[EdgeType]:
-        with self._client as driver, driver.session(database="neo4j") as session:
+        with self._client.session(database="neo4j") as session:
             query_str = (
-                f"MATCH ()-[r]-() WHERE r.user_id = '{user_id}' RETURN r "
-                f"ORDER BY ID(r) SKIP {offset} LIMIT {limit};"
+                "MATCH ()-[r]-() WHERE r.user_id = $user_id RETURN r "
+                "ORDER BY ID(r) SKIP $offset LIMIT $limit;"
             )
 
             results = self._run_query(
                 session,
                 query_str,
+                parameters={"user_id": str(user_id), "offset": offset, "limit": limit},
             )
             edges = [result["r"] for result in results]
             edges = [Neo4jUserGraph._map_edge(e) for e in edges]
@@ -319,15 +355,15 @@ class Neo4jUserGraph(
 
     def edges(self, offset: int = 0, limit: int = 50) -> list[EdgeType]:
         # NOTE: this will double count directed edges as two undirected edges
-        with self._client as driver, driver.session(database="neo4j") as session:
+        with self._client.session(database="neo4j") as session:
             query_str = (
-                f"MATCH ()-[r]-() RETURN r "
-                f"ORDER BY ID(r) SKIP {offset} LIMIT {limit};"
+                "MATCH ()-[r]-() RETURN r ORDER BY ID(r) SKIP $offset LIMIT $limit;"
             )
 
             results = self._run_query(
                 session,
                 query_str,
+                parameters={"offset": offset, "limit": limit},
             )
             edges = [result["r"] for result in results]
             edges = [Neo4jUserGraph._map_edge(e) for e in edges]
@@ -335,27 +371,32 @@ class Neo4jUserGraph(
             return edges
 
     def count_nodes(self, label: str | None = None) -> int:
-        with self._client as driver, driver.session(database="neo4j") as session:
+        with self._client.session(database="neo4j") as session:
             if label is None:
                 query_str = "MATCH (n) RETURN COUNT(n) AS nodeCount;"
             else:
-                query_str = f"MATCH (n:{label}) RETURN COUNT(n) AS nodeCount;"
+                query_str = (
+                    f"MATCH (n:{_identifier(label)}) RETURN COUNT(n) AS nodeCount;"
+                )
 
             return self._run_query(session, query_str).single(strict=True)["nodeCount"]
 
     def count_edges(self, relationship_type: str | None = None) -> int:
-        with self._client as driver, driver.session(database="neo4j") as session:
+        with self._client.session(database="neo4j") as session:
             if relationship_type is None:
                 query_str = "MATCH ()-[r]->() RETURN COUNT(r) AS edgeCount;"
             else:
-                query_str = f"MATCH ()-[r:{relationship_type}]->() RETURN COUNT(r) AS edgeCount;"
+                query_str = (
+                    f"MATCH ()-[r:{_identifier(relationship_type)}]->() "
+                    "RETURN COUNT(r) AS edgeCount;"
+                )
 
             return self._run_query(session, query_str).single(strict=True)["edgeCount"]
 
     def count_nodes_with_property_value(
         self, label: str, property_key: str, property_value: Any
     ) -> int:
-        with self._client as driver, driver.session() as session:
+        with self._client.session() as session:
             # Neo4j uses the ISO 8601 date and time format
             # for representing datetime values
             if type(property_value) == datetime:
@@ -364,7 +405,8 @@ class Neo4jUserGraph(
                 property_value = str(property_value)
 
             query_str = (
-                f"MATCH (n:{label}) WHERE n.{property_key} = $property_value "
+                f"MATCH (n:{_identifier(label)}) "
+                f"WHERE n.{_identifier(property_key)} = $property_value "
                 "RETURN COUNT(n) AS nodeCount;"
             )
 
@@ -383,7 +425,7 @@ class Neo4jUserGraph(
     def delete_nodes_with_property_value(
         self, label: str, property_key: str, property_value: Any
     ):
-        with self._client as driver, driver.session() as session:
+        with self._client.session() as session:
             # Neo4j uses the ISO 8601 date and time format
             # for representing datetime values
             if type(property_value) == datetime:
@@ -393,7 +435,8 @@ class Neo4jUserGraph(
             # Delete all nodes with a certain property value, also detaches
             # and deletes all relationships connected to that node.
             query_str = (
-                f"MATCH (n:{label} {{{property_key}: $property_value}}) "
+                f"MATCH (n:{_identifier(label)} "
+                f"{{{_identifier(property_key)}: $property_value}}) "
                 "DETACH DELETE n;"
             )
 
@@ -408,11 +451,11 @@ class Neo4jUserGraph(
             )
 
     def delete_nodes_with_label(self, label: str):
-        with self._client as driver, driver.session() as session:
+        with self._client.session() as session:
             # detaches and deletes all relationships connected to that node.
-            query_str = f"MATCH (n:{label}) DETACH DELETE n;"
+            query_str = f"MATCH (n:{_identifier(label)}) DETACH DELETE n;"
 
-            self._run_query(session, query_str, parameters={"label": label})
+            self._run_query(session, query_str)
 
     @staticmethod
     def _map_node(neo4j_node: Neo4jNode) -> Node:
@@ -471,7 +514,7 @@ class Neo4jUserGraph(
         tx.run("MATCH (n) DELETE n")
 
     def delete_all(self) -> None:
-        with self._client as driver, driver.session(database="neo4j") as session:
+        with self._client.session(database="neo4j") as session:
             session.execute_write(self._delete_all_nodes_and_relationships)
 
     @property
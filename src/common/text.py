@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Callable
 
@@ -38,6 +39,18 @@ EmbedFunc = Callable[[str], list[float]]
 # embedding actually takes place.
 NotImplementedEmbedFunc: EmbedFunc = lambda _: _not_implemented()
 
+# Batch text embedding function signature (one vector per text, in order).
+EmbedBatchFunc = Callable[[list[str]], list[list[float]]]
+
+
+def embed_one_by_one(embed_func: EmbedFunc) -> EmbedBatchFunc:
+    """
+    Fallback EmbedBatchFunc for embedding functions that don't support
+    batching: embeds texts one at a time.
+    """
+    return lambda texts: [embed_func(text) for text in texts]
+
+
 # Cross-encoding function signature.
 CrossEncodeFunc = Callable[[CrossEncodeInput], CrossEncodeOutput]
 
@@ -45,11 +58,28 @@ CrossEncodeFunc = Callable[[CrossEncodeInput], CrossEncodeOutput]
 # no cross-encoding actually takes place.
 NotImplementedCrossEncodeFunc: CrossEncodeFunc = lambda _: _not_implemented()
 
+# Batch cross-encoding function signature (one output per input, in order).
+CrossEncodeBatchFunc = Callable[[list[CrossEncodeInput]], list[CrossEncodeOutput]]
+
+
+def cross_encode_one_by_one(
+    cross_encode_func: CrossEncodeFunc,
+) -> CrossEncodeBatchFunc:
+    """
+    Fallback CrossEncodeBatchFunc for cross-encoding functions that don't
+    support batching: cross-encodes inputs one at a time.
+    """
+    return lambda inputs: [cross_encode_func(input) for input in inputs]
+
+
+# Upper bound on concurrent requests to the cross-encoding service.
+_max_parallel_cross_encodes = 8
+
 
 class TextServices:
     """
-    Class that implements EmbedFunc and CrossEncodeFunc backed by remote
-    HTTP services.
+    Class that implements EmbedFunc, EmbedBatchFunc, CrossEncodeFunc and
+    CrossEncodeBatchFunc backed by remote HTTP services.
     """
 
     def __init__(
@@ -61,6 +91,13 @@ class TextServices:
         self._xenc_svc_url = cross_encoding_service_url
 
     def embed(self, text: str) -> list[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed all texts with a single request (and a single batched forward
+        pass through the model), returning their vectors in the same order.
+        """
         payload_embed = {
             "document": [
                 {
@@ -68,17 +105,27 @@ class TextServices:
                     # Required by service but not relevant for text embedding.
                     # (Service supports embedding a string as well as documents,
                     # but these arguments are only relevant for documents.)
-                    "paragraph_number": 1,
+                    # Paragraph numbers are used to map vectors back to texts.
+                    "paragraph_number": i + 1,
                     "sentence_numbers": [1],
                 }
+                for i, text in enumerate(texts)
             ]
         }
         response = requests.post(self._embed_svc_url, json=payload_embed)
 
-        # Guaranteed to always return content
-        query_vector: list[float] = response.json()[0]["vector"]
+        # Guaranteed to always return content (one result per paragraph)
+        results = sorted(response.json(), key=lambda r: r["paragraph_number"])
+        if len(results) != len(texts):
+            # Callers pair vectors with texts by position; don't let a short
+            # response silently drop (or misalign) texts.
+            raise RuntimeError(
+                f"embedding service returned {len(results)} vectors "
+                f"for {len(texts)} texts"
+            )
+        query_vectors: list[list[float]] = [r["vector"] for r in results]
 
-        return query_vector
+        return query_vectors
 
     def cross_encode(self, input: CrossEncodeInput) -> CrossEncodeOutput:
         """
@@ -100,3 +147,22 @@ class TextServices:
             sentence_number=int(response["sentence_number"]),
             score=float(response["score"]),
         )
+
+    def cross_encode_batch(
+        self,
+        inputs: list[CrossEncodeInput],
+    ) -> list[CrossEncodeOutput]:
+        """
+        Cross-encode all inputs, returning the best matching sentence for each
+        (in the same order).
+
+        The service scores one query against its sentences per request, so
+        requests are issued concurrently rather than one after the other.
+        """
+        if len(inputs) <= 1:
+            return [self.cross_encode(input) for input in inputs]
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(inputs), _max_parallel_cross_encodes)
+        ) as executor:
+            return list(executor.map(self.cross_encode, inputs))
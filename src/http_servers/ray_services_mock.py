@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+from typing import Any
+
 from fastapi import FastAPI
 
 # Mocks for ray HTTP services. For local development only.
@@ -7,14 +9,16 @@ app = FastAPI(title="ray services mock")
 
 
 @app.post("/engine-paragraph/embed")
-def embed():
+def embed(payload: dict[str, Any]):
+    # One (constant) vector per document, like the real service.
     return [
         {
-            "paragraph_number": 0,
-            "sentence_numbers": [0],
-            "text": "title",
+            "paragraph_number": document["paragraph_number"],
+            "sentence_numbers": document["sentence_numbers"],
+            "text": document["text"],
             "vector": [1, 1, 1, 1],
         }
+        for document in payload["document"]
     ]
 
 
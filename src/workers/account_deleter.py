@@ -152,6 +152,11 @@ class AccountDeleter:
             )
             total += len(objects_to_delete)
 
+            # Everything under the prefix fit in this listing; no need for
+            # another round-trip just to find out there's nothing left.
+            if not response.get("IsTruncated", False):
+                break
+
         logger.info(
             "Deleted {total} S3 objects for {user}.",
             total=total,
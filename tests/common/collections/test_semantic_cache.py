@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import time
+
+from hamcrest import assert_that, equal_to, is_, none
+
+from common.collections.semantic_cache import SemanticQueryCache
+
+
+def test_semantic_cache_hits_similar_queries_under_same_key() -> None:
+    cache = SemanticQueryCache[str](min_similarity=0.95)
+    cache.put("user-1", [1.0, 0.0, 0.0], "results")
+
+    # Same direction, different magnitude: identical for cosine similarity.
+    assert_that(cache.get("user-1", [2.0, 0.0, 0.0]), is_(equal_to("results")))
+    assert_that(cache.get("user-1", [1.0, 0.1, 0.0]), is_(equal_to("results")))
+    # Dissimilar query, or different key.
+    assert_that(cache.get("user-1", [0.0, 1.0, 0.0]), is_(none()))
+    assert_that(cache.get("user-2", [1.0, 0.0, 0.0]), is_(none()))
+
+
+def test_semantic_cache_returns_most_similar_entry() -> None:
+    cache = SemanticQueryCache[str](min_similarity=0.5)
+    cache.put("key", [1.0, 0.0], "x")
+    cache.put("key", [0.0, 1.0], "y")
+
+    assert_that(cache.get("key", [0.2, 1.0]), is_(equal_to("y")))
+    assert_that(cache.get("key", [1.0, 0.2]), is_(equal_to("x")))
+
+
+def test_semantic_cache_evicts_least_recently_hit_entry() -> None:
+    cache = SemanticQueryCache[str](max_entries_per_key=2)
+    cache.put("key", [1.0, 0.0, 0.0], "x")
+    cache.put("key", [0.0, 1.0, 0.0], "y")
+    cache.get("key", [1.0, 0.0, 0.0])  # x is now more recent than y
+    cache.put("key", [0.0, 0.0, 1.0], "z")
+
+    assert_that(cache.get("key", [1.0, 0.0, 0.0]), is_(equal_to("x")))
+    assert_that(cache.get("key", [0.0, 1.0, 0.0]), is_(none()))
+    assert_that(cache.get("key", [0.0, 0.0, 1.0]), is_(equal_to("z")))
+
+
+def test_semantic_cache_evicts_least_recently_used_key() -> None:
+    cache = SemanticQueryCache[str](max_keys=2)
+    cache.put("a", [1.0], "a")
+    cache.put("b", [1.0], "b")
+    cache.get("a", [1.0])  # b is now the least recently used key
+    cache.put("c", [1.0], "c")
+
+    assert_that(cache.get("a", [1.0]), is_(equal_to("a")))
+    assert_that(cache.get("b", [1.0]), is_(none()))
+    assert_that(cache.get("c", [1.0]), is_(equal_to("c")))
+
+
+def test_semantic_cache_expires_entries() -> None:
+    cache = SemanticQueryCache[str](ttl_seconds=0.01)
+    cache.put("key", [1.0, 0.0], "x")
+    time.sleep(0.02)
+
+    assert_that(cache.get("key", [1.0, 0.0]), is_(none()))
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+from hamcrest import assert_that, equal_to, is_
+
+from common.collections.paragraph import Filter, ParagraphV2, SentenceMatch
+from common.collections.semantic_cache import SemanticQueryCache
+from common.collections.weaviate.paragraph_v2 import WeaviateParagraphV2Collection
+from common.text import CrossEncodeInput, CrossEncodeOutput
+
+from ....test_lib.services import TestServices
+
+_vectors = {
+    "apples": [1.0, 0.0, 0.0],
+    "bananas": [0.0, 1.0, 0.0],
+}
+
+
+def _cross_encode(input: CrossEncodeInput) -> CrossEncodeOutput:
+    # Always pick the last sentence of the paragraph.
+    return CrossEncodeOutput(
+        sentence=input.sentences[-1],
+        sentence_number=input.sentence_numbers[-1],
+        score=1.0,
+    )
+
+
+@pytest.fixture
+def embed_batches() -> list[list[str]]:
+    return []
+
+
+@pytest.fixture
+def test_collection(
+    external_deps: TestServices,
+    embed_batches: list[list[str]],
+) -> WeaviateParagraphV2Collection:
+    def embed_batch(texts: list[str]) -> list[list[float]]:
+        embed_batches.append(texts)
+        return [_vectors[text] for text in texts]
+
+    return WeaviateParagraphV2Collection(
+        client=external_deps.vec_db_client(truncate_all_classes=True),
+        embed_func=lambda text: _vectors[text],
+        cross_encode_func=_cross_encode,
+        embed_batch_func=embed_batch,
+    )
+
+
+def _paragraph(
+    user: str,
+    doc_id: str,
+    sentences: list[str],
+    vector: list[float],
+) -> ParagraphV2:
+    return ParagraphV2(
+        id=ParagraphV2.random_id(),
+        user_id=ParagraphV2.deterministic_id(user),
+        vector=vector,
+        doc_id=doc_id,
+        text="</s><s>".join(sentences),
+        paragraph_number=1,
+        sentence_numbers=list(range(1, len(sentences) + 1)),
+        doc_type="web",
+        domain="example.com",
+        title="title",
+        summary="summary",
+        byline=None,
+        last_visited=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        score=0.0,
+    )
+
+
+def _found(matches: list[SentenceMatch]) -> list[tuple[str, int]]:
+    return [(m.document_id, m.sentence_number) for m in matches]
+
+
+def test_weaviate_paragraph_v2_find_similar_sentences_many(
+    test_collection: WeaviateParagraphV2Collection,
+    embed_batches: list[list[str]],
+) -> None:
+    # Test covers:
+    # - one embedding batch for all queries
+    # - results grouped per query, in query order
+    # - cross-encoding of multi-sentence paragraphs
+    # - queries without matches
+    test_collection.create_many(
+        [
+            _paragraph("user-a", "doc-a1", ["Apples are red."], [1.0, 0.0, 0.0]),
+            _paragraph("user-a", "doc-a2", ["Pears.", "Plums."], [0.0, 0.0, 1.0]),
+            _paragraph("user-b", "doc-b1", ["Bananas are yellow."], [0.0, 1.0, 0.0]),
+        ]
+    )
+    user_a = Filter(user_id=ParagraphV2.deterministic_id("user-a"))
+    user_b = Filter(user_id=ParagraphV2.deterministic_id("user-b"))
+    user_a_email = Filter(user_id=user_a.user_id, doc_type="email")
+
+    found = test_collection.find_similar_sentences_many(
+        [
+            ("apples", user_a, 1),
+            ("bananas", user_b, 5),
+            ("apples", user_a, 5),
+            ("bananas", user_a_email, 5),
+        ]
+    )
+
+    assert_that(
+        [_found(matches) for matches in found],
+        is_(
+            equal_to(
+                [
+                    [("doc-a1", 1)],
+                    [("doc-b1", 1)],
+                    [("doc-a1", 1), ("doc-a2", 2)],
+                    [],
+                ]
+            )
+        ),
+    )
+    assert_that(
+        embed_batches,
+        is_(equal_to([["apples", "bananas", "apples", "bananas"]])),
+    )
+    assert_that(test_collection.find_similar_sentences_many([]), is_(equal_to([])))
+
+
+class _RecordingQuery:
+    """Stands in for the weaviate query builder; records each hybrid query."""
+
+    def __init__(self) -> None:
+        self.queries: list[str] = []
+        self.query = self
+
+    def get(self, *_: Any) -> "_RecordingQuery":
+        return self
+
+    def with_where(self, *_: Any) -> "_RecordingQuery":
+        return self
+
+    def with_hybrid(self, query: str, **_: Any) -> "_RecordingQuery":
+        self.queries.append(query)
+        return self
+
+    def with_additional(self, *_: Any) -> "_RecordingQuery":
+        return self
+
+    def with_limit(self, *_: Any) -> "_RecordingQuery":
+        return self
+
+    def do(self) -> dict[str, Any]:
+        paragraph = {
+            "doc_id": "doc-a1",
+            "text": "Apples are red.",
+            "sentence_numbers": [1],
+            "_additional": {"score": 0.5},
+        }
+        return {"data": {"Get": {"Paragraph_v20231120": [paragraph]}}}
+
+
+def test_weaviate_paragraph_v2_query_cache_keys_on_text_below_alpha_1() -> None:
+    # "apple pie" embeds almost exactly like "apples": close enough for the
+    # cache, but the BM25 half of a hybrid query would match other paragraphs.
+    vectors = {"apples": [1.0, 0.0, 0.0], "apple pie": [1.0, 0.01, 0.0]}
+    client = _RecordingQuery()
+    collection = WeaviateParagraphV2Collection(
+        client=client,  # type: ignore[arg-type]
+        embed_func=lambda text: vectors[text],
+        cross_encode_func=_cross_encode,
+        query_cache=SemanticQueryCache(),
+    )
+    user = Filter(user_id=ParagraphV2.deterministic_id("user-a"))
+
+    collection.find_similar_sentences("apples", user, 5, hybrid_search_factor=0.5)
+    collection.find_similar_sentences("apple pie", user, 5, hybrid_search_factor=0.5)
+    assert_that(client.queries, is_(equal_to(["apples", "apple pie"])))
+
+    # Pure vector search: the similar vector is served from the cache.
+    collection.find_similar_sentences("apples", user, 5, hybrid_search_factor=1.0)
+    collection.find_similar_sentences("apple pie", user, 5, hybrid_search_factor=1.0)
+    assert_that(client.queries, is_(equal_to(["apples", "apple pie", "apples"])))
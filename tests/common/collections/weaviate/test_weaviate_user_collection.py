@@ -98,3 +98,81 @@ def test_weaviate_user_collection_delete_by_user_id(
 
     test_collection.delete_by_user_id(user_id)
     assert_that(test_collection.count_by_user_id(user_id), is_(equal_to(0)))
+
+
+def test_weaviate_user_collection_get_many_by_ids(
+    test_collection: ExampleWeaviateUserCollection,
+) -> None:
+    # Test covers:
+    # - batch create
+    # - multi-object read by id (including missing ids)
+    to_create: list[ExampleObject] = []
+    user_id = ExampleObject.deterministic_id("user-0")
+    for i in range(5):
+        to_create.append(
+            ExampleObject(
+                id=ExampleObject.random_id(),
+                user_id=user_id,
+                vector=[1.0, 2.0, 3.0],
+                str_field="str_field",
+                int_field=i,
+                list_field=["list_field"],
+            )
+        )
+
+    test_collection.create_many(to_create)
+
+    missing_id = ExampleObject.random_id()
+    read = test_collection.get_many_by_ids(
+        [to_create[0].id, to_create[3].id, missing_id]
+    )
+
+    assert_that(
+        read,
+        is_(equal_to({to_create[0].id: to_create[0], to_create[3].id: to_create[3]})),
+    )
+    assert_that(test_collection.get_many_by_ids([]), is_(equal_to({})))
+
+
+def test_weaviate_user_collection_iter_by_user_id(
+    test_collection: ExampleWeaviateUserCollection,
+) -> None:
+    # Test covers:
+    # - batch create
+    # - paged iteration, with a partial last page
+    # - paged iteration, with a number of objects that is a multiple of the
+    #   page size (the last page is empty)
+    # - iteration without any objects
+    to_create: list[ExampleObject] = []
+    user_id = ExampleObject.deterministic_id("user-0")
+    for i in range(9):
+        to_create.append(
+            ExampleObject(
+                id=ExampleObject.random_id(),
+                user_id=user_id,
+                vector=[1.0, 2.0, 3.0],
+                str_field="str_field",
+                int_field=i,
+                list_field=["list_field"],
+            )
+        )
+
+    test_collection.create_many(to_create)
+
+    # 5 pages (2 + 2 + 2 + 2 + 1), more than are kept in flight.
+    read = list(test_collection.iter_by_user_id(user_id, page_size=2, max_in_flight=2))
+    assert_that(len(read), is_(equal_to(9)))
+    assert_that(read, contains_inanyorder(*to_create))
+
+    # 3 full pages, then an empty one.
+    read = list(test_collection.iter_by_user_id(user_id, page_size=3, max_in_flight=2))
+    assert_that(len(read), is_(equal_to(9)))
+    assert_that(read, contains_inanyorder(*to_create))
+
+    # A single page, more than enough for all objects.
+    read = list(test_collection.iter_by_user_id(user_id, page_size=100))
+    assert_that(len(read), is_(equal_to(9)))
+    assert_that(read, contains_inanyorder(*to_create))
+
+    other_user_id = ExampleObject.deterministic_id("user-1")
+    assert_that(list(test_collection.iter_by_user_id(other_user_id)), is_(equal_to([])))
@@ -6,7 +6,8 @@ from hamcrest import assert_that, is_
 from ldclient import Config
 from ldclient.integrations.test_data import TestData
 
-from common.features.launchdarkly import LDFeatures
+from common.features.features import Snapshot
+from common.features.launchdarkly import LDFeatures, _EvalCache
 
 
 @pytest.fixture
@@ -133,3 +134,110 @@ def test_launchdarkly_operational(features: LDFeatures, td: TestData):
         foo_value_op.get(),
         is_(DC(a="qux", b=1)),
     )
+
+
+def test_launchdarkly_caches_evaluations(td: TestData):
+    cached = LDFeatures(
+        config=Config("fake-key", update_processor_class=td),
+        cache_ttl_secs=60,
+    )
+    uncached = LDFeatures(
+        config=Config("fake-key", update_processor_class=td),
+        cache_ttl_secs=0,
+    )
+
+    td.update(td.flag("release.cached").on(True))
+    assert_that(cached.release("cached").is_enabled(), is_(True))
+    assert_that(uncached.release("cached").is_enabled(), is_(True))
+
+    # Within the TTL, the previous evaluation is reused.
+    td.update(td.flag("release.cached").on(False))
+    assert_that(cached.release("cached").is_enabled(), is_(True))
+    assert_that(uncached.release("cached").is_enabled(), is_(False))
+
+
+def test_launchdarkly_cache_distinguishes_defaults(td: TestData):
+    features = LDFeatures(
+        config=Config("fake-key", update_processor_class=td),
+        cache_ttl_secs=60,
+    )
+
+    # Unset flags evaluate to the default of each feature.
+    assert_that(features.release("unset", default_enabled=True).is_enabled(), is_(True))
+    assert_that(
+        features.release("unset", default_enabled=False).is_enabled(),
+        is_(False),
+    )
+
+
+def test_eval_cache_invalidates_changed_flags():
+    cache = _EvalCache(ttl_secs=60)
+    evaluations: list[str] = []
+
+    def evaluate(value: str):
+        def _evaluate() -> str:
+            evaluations.append(value)
+            return value
+
+        return _evaluate
+
+    assert_that(cache.get_or_eval("flag", "ctx", "None", evaluate("a")), is_("a"))
+    assert_that(cache.get_or_eval("flag", "ctx", "None", evaluate("b")), is_("a"))
+    assert_that(cache.get_or_eval("other", "ctx", "None", evaluate("c")), is_("c"))
+
+    # Only entries of the changed flag are dropped.
+    cache.invalidate("flag")
+    assert_that(cache.get_or_eval("flag", "ctx", "None", evaluate("d")), is_("d"))
+    assert_that(cache.get_or_eval("other", "ctx", "None", evaluate("e")), is_("c"))
+    assert_that(evaluations, is_(["a", "c", "d"]))
+
+
+def test_eval_cache_evicts_least_recently_used_entries():
+    cache = _EvalCache(ttl_secs=60, max_entries=2)
+    cache.get_or_eval("flag", "user-1", "None", lambda: 1)
+    cache.get_or_eval("flag", "user-2", "None", lambda: 2)
+    cache.get_or_eval("flag", "user-1", "None", lambda: -1)  # user-2 now LRU
+    cache.get_or_eval("flag", "user-3", "None", lambda: 3)
+
+    assert_that(cache.get_or_eval("flag", "user-1", "None", lambda: -1), is_(1))
+    assert_that(cache.get_or_eval("flag", "user-3", "None", lambda: -1), is_(3))
+    assert_that(cache.get_or_eval("flag", "user-2", "None", lambda: -1), is_(-1))
+
+
+def test_launchdarkly_snapshot(features: LDFeatures, td: TestData):
+    td.update(td.flag("release.snapshot").on(True))
+    td.update(td.flag("killswitch.snapshot").fallthrough_variation(False))
+    td.update(td.flag("operational.snapshot").value_for_all(42))
+    td.update(
+        td.flag("permission.snapshot")
+        .variation_for_user("admin@re-collect.ai", True)
+        .fallthrough_variation(False)
+    )
+
+    snapshot = features.snapshot()
+    assert_that(snapshot.release("snapshot"), is_(True))
+    assert_that(snapshot.killswitch("snapshot"), is_(False))
+    assert_that(snapshot.operational("snapshot", int, -1), is_(42))
+    # Flags missing from the snapshot fall back to their default.
+    assert_that(snapshot.operational("unset", str, "default"), is_("default"))
+
+    assert_that(
+        features.snapshot("admin@re-collect.ai").permission("snapshot"),
+        is_(True),
+    )
+    assert_that(
+        features.snapshot("user@re-collect.ai").permission("snapshot"),
+        is_(False),
+    )
+    # Flags that don't depend on the context are the same in any snapshot.
+    assert_that(features.snapshot("user@re-collect.ai").release("snapshot"), is_(True))
+
+    # Same values as with the default implementation (one toggle at a time).
+    for snapshot in (
+        Snapshot(features, "admin@re-collect.ai"),
+        features.snapshot("admin@re-collect.ai"),
+    ):
+        assert_that(snapshot.release("snapshot"), is_(True))
+        assert_that(snapshot.killswitch("snapshot"), is_(False))
+        assert_that(snapshot.operational("snapshot", int, -1), is_(42))
+        assert_that(snapshot.permission("snapshot"), is_(True))
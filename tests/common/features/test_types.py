@@ -35,6 +35,12 @@ def test_check_valid_types():
     except TypeError:
         pass
 
+    try:
+        check_valid_type("int-flag", int, True)
+        assert False, "expected TypeError"
+    except TypeError:
+        pass
+
     try:
         check_valid_type("class-flag", Bar, None)
         assert False, "expected TypeError"
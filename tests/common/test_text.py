@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+from typing import Any
+
+from hamcrest import assert_that, equal_to, is_
+from pytest import MonkeyPatch
+
+from common.text import TextServices
+
+
+class _FakeResponse:
+    def __init__(self, body: Any) -> None:
+        self._body = body
+
+    def json(self) -> Any:
+        return self._body
+
+
+def test_text_services_embed_batch_maps_vectors_to_texts(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    def post(url: str, json: dict[str, Any]) -> _FakeResponse:
+        # Respond out of order; vectors are matched back by paragraph number.
+        return _FakeResponse(
+            [
+                {"paragraph_number": d["paragraph_number"], "vector": [len(d["text"])]}
+                for d in reversed(json["document"])
+            ]
+        )
+
+    monkeypatch.setattr("requests.post", post)
+    services = TextServices("http://embed", "http://xenc")
+
+    assert_that(
+        services.embed_batch(["a", "bb", "ccc"]),
+        is_(equal_to([[1], [2], [3]])),
+    )
+    assert_that(services.embed("dddd"), is_(equal_to([4])))
+
+
+def test_text_services_embed_batch_raises_on_missing_vectors(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    def post(url: str, json: dict[str, Any]) -> _FakeResponse:
+        # A single vector, whatever the input.
+        return _FakeResponse([{"paragraph_number": 0, "vector": [1.0]}])
+
+    monkeypatch.setattr("requests.post", post)
+    services = TextServices("http://embed", "http://xenc")
+
+    try:
+        services.embed_batch(["a", "b"])
+        assert False, "expected RuntimeError"
+    except RuntimeError:
+        pass